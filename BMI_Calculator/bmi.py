@@ -1,49 +1,79 @@
 # app.py - Main Streamlit Application
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
+import bisect
 import datetime
+import importlib
 import json
 import os
+import sys
+import time
+import argparse
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
 
-# Set page configuration
-st.set_page_config(
-    page_title="BMI Calculator Dashboard",
-    page_icon="🏋️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Apply custom CSS
-st.markdown("""
-    <style>
-    .main {
-        padding: 2rem;
-    }
-    .stAlert {
-        padding: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .result-box {
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .metric-container {
-        display: flex;
-        justify-content: space-between;
-        flex-wrap: wrap;
-    }
-    .metric-card {
-        background-color: #2ecc71;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        width: 48%;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+from history_store import MemoryHistoryStore, open_history_store
+
+# Charts are rendered to images, so matplotlib never needs a GUI backend
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# Heavy libraries are loaded when a tab or command first uses them
+pd = LazyModule("pandas")
+go = LazyModule("plotly.graph_objects")
+plt = LazyModule("matplotlib.pyplot")
+np = LazyModule("numpy")
+
+
+def setup_page():
+    """Configure the Streamlit page and inject the custom CSS"""
+    # Set page configuration
+    st.set_page_config(
+        page_title="BMI Calculator Dashboard",
+        page_icon="🏋️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # Apply custom CSS
+    st.markdown("""
+        <style>
+        .main {
+            padding: 2rem;
+        }
+        .stAlert {
+            padding: 0.5rem;
+            margin-bottom: 1rem;
+        }
+        .result-box {
+            padding: 1.5rem;
+            border-radius: 0.5rem;
+            margin: 1rem 0;
+        }
+        .metric-container {
+            display: flex;
+            justify-content: space-between;
+            flex-wrap: wrap;
+        }
+        .metric-card {
+            background-color: #2ecc71;
+            border-radius: 0.5rem;
+            padding: 1rem;
+            margin: 0.5rem 0;
+            width: 48%;
+        }
+        </style>
+        """, unsafe_allow_html=True)
 
 
 # Utility functions
@@ -60,44 +90,81 @@ def calculate_bmi(weight, height, units="metric"):
     return round(bmi, 1)
 
 
+# Category table: BMI_BREAKPOINTS[i] is the lower bound of BMI_CATEGORIES[i + 1]
+BMI_BREAKPOINTS = [18.5, 25, 30, 35, 40]
+BMI_CATEGORIES = [
+    ("Underweight", "#3498db"),  # Blue
+    ("Normal weight", "#2ecc71"),  # Green
+    ("Overweight", "#f39c12"),  # Orange
+    ("Obesity (Class 1)", "#e67e22"),  # Dark Orange
+    ("Obesity (Class 2)", "#e74c3c"),  # Red
+    ("Obesity (Class 3)", "#c0392b"),  # Dark Red
+]
+BMI_COLORS = [color for _, color in BMI_CATEGORIES]
+
+
 def get_bmi_category(bmi):
     """Return BMI category based on value"""
-    if bmi < 18.5:
-        return "Underweight", "#3498db"  # Blue
-    elif 18.5 <= bmi < 25:
-        return "Normal weight", "#2ecc71"  # Green
-    elif 25 <= bmi < 30:
-        return "Overweight", "#f39c12"  # Orange
-    elif 30 <= bmi < 35:
-        return "Obesity (Class 1)", "#e67e22"  # Dark Orange
-    elif 35 <= bmi < 40:
-        return "Obesity (Class 2)", "#e74c3c"  # Red
-    else:
-        return "Obesity (Class 3)", "#c0392b"  # Dark Red
+    return BMI_CATEGORIES[bisect.bisect_right(BMI_BREAKPOINTS, bmi)]
+
+
+def calculate_bmi_batch(weight, height, units="metric"):
+    """Calculate BMI, category codes and colors for whole arrays at once.
+
+    weight, height and units may be NumPy arrays, pandas Series or scalars
+    and are broadcast against each other. Returns (bmi, codes, colors) as
+    NumPy arrays, where codes index into BMI_CATEGORIES. Values match
+    calculate_bmi/get_bmi_category row for row; a zero height gives inf
+    instead of raising. Rows with a missing weight or height get a NaN
+    BMI, code -1 and an empty color.
+    """
+    weight, height, units = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(weight, dtype=np.float64)),
+        np.atleast_1d(np.asarray(height, dtype=np.float64)),
+        np.atleast_1d(np.asarray(units)),
+    )
+    metric = units == "metric"
 
+    # Same operation order as calculate_bmi so the raw floats agree
+    with np.errstate(divide="ignore", invalid="ignore"):
+        height_m = height / 100
+        raw = np.where(metric, weight / (height_m ** 2), (weight * 703) / (height ** 2))
+        bmi = np.round(raw, 1)
 
-def create_gauge_chart(bmi):
-    """Create a gauge chart to visualize BMI"""
-    category, color = get_bmi_category(bmi)
+        # np.round scales by 10 before rounding, which can disagree with the
+        # exact rounding of round() when a value sits on a .x5 boundary.
+        # Only those few rows are recomputed with the scalar function.
+        scaled = np.abs(raw * 10)
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        bmi[i] = calculate_bmi(float(weight[i]), float(height[i]),
+                               "metric" if metric[i] else "imperial")
+
+    missing = np.isnan(bmi)
+    codes = np.where(missing, -1, np.searchsorted(BMI_BREAKPOINTS, bmi, side="right"))
+    colors = np.where(missing, "", np.asarray(BMI_COLORS)[codes])
+    return bmi, codes, colors
 
+
+GAUGE_CACHE_SIZE = 1024  # Distinct one-decimal BMI values kept as ready-made gauges
+
+
+@st.cache_resource
+def gauge_template():
+    """Build the gauge once with the static axis, steps and layout"""
+    bounds = [0] + BMI_BREAKPOINTS + [50]
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
-        value=bmi,
         domain={"x": [0, 1], "y": [0, 1]},
         title={"text": "BMI", "font": {"size": 24}},
         gauge={
             "axis": {"range": [None, 50], "tickwidth": 1, "tickcolor": "darkblue"},
-            "bar": {"color": color},
             "bgcolor": "white",
             "borderwidth": 2,
             "bordercolor": "gray",
             "steps": [
-                {"range": [0, 18.5], "color": "#3498db"},
-                {"range": [18.5, 25], "color": "#2ecc71"},
-                {"range": [25, 30], "color": "#f39c12"},
-                {"range": [30, 35], "color": "#e67e22"},
-                {"range": [35, 40], "color": "#e74c3c"},
-                {"range": [40, 50], "color": "#c0392b"}
+                {"range": [low, high], "color": color}
+                for low, high, (_, color) in zip(bounds, bounds[1:], BMI_CATEGORIES)
             ],
         }
     ))
@@ -110,19 +177,41 @@ def create_gauge_chart(bmi):
     return fig
 
 
-def load_user_data():
-    """Load saved BMI history"""
-    if 'bmi_history' not in st.session_state:
-        st.session_state.bmi_history = []
+@st.cache_resource(max_entries=GAUGE_CACHE_SIZE)
+def _gauge_figure(bmi):
+    """Copy the template and fill in the value; cached per rounded BMI"""
+    _, color = get_bmi_category(bmi)
+    fig = go.Figure(gauge_template())
+    fig.update_traces(value=bmi, gauge_bar_color=color)
+    return fig
 
-    return st.session_state.bmi_history
 
+def create_gauge_chart(bmi):
+    """Create a gauge chart to visualize BMI"""
+    return _gauge_figure(round(float(bmi), 1))
 
-def save_bmi_calculation(weight, height, bmi, units):
-    """Save current BMI calculation to history"""
-    if 'bmi_history' not in st.session_state:
-        st.session_state.bmi_history = []
 
+@st.cache_resource
+def get_history_store():
+    """Open the history backend once and share it between sessions"""
+    return open_history_store()
+
+
+def get_session_history_store():
+    """Keep history for a session without a profile in memory, so it ends with the session"""
+    if "session_history" not in st.session_state:
+        st.session_state.session_history = MemoryHistoryStore()
+    return st.session_state.session_history
+
+
+def load_user_data(user="default", store=None):
+    """Load saved BMI history: returns the store and the number of entries for user"""
+    store = store or get_history_store()
+    return store, store.count(user)
+
+
+def save_bmi_calculation(weight, height, bmi, units, user="default", store=None):
+    """Save current BMI calculation to history"""
     date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     bmi_data = {
@@ -134,19 +223,48 @@ def save_bmi_calculation(weight, height, bmi, units):
         "category": get_bmi_category(bmi)[0]
     }
 
-    st.session_state.bmi_history.append(bmi_data)
+    (store or get_history_store()).append(user, bmi_data)
 
 
-def create_history_chart(history):
-    """Create a line chart showing BMI history"""
-    if not history:
-        return None
+MAX_CHART_POINTS = 500  # History charts are downsampled to this many points
+CHART_CACHE_SIZE = 16  # Figures kept alive across reruns before the oldest is closed
 
-    df = pd.DataFrame(history)
-    df['date'] = pd.to_datetime(df['date'])
 
+def lttb(x, y, threshold):
+    """Return the indices kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+    kept[-1] = n - 1
+    return kept
+
+
+def _new_history_figure():
+    """Build the static parts of the history chart; returns the figure and its empty line"""
     fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(df['date'], df['bmi'], marker='o', linestyle='-', color='#3498db')
+    line, = ax.plot([], [], marker='o', linestyle='-', color='#3498db')
     ax.axhspan(0, 18.5, color='#3498db', alpha=0.1)
     ax.axhspan(18.5, 25, color='#2ecc71', alpha=0.1)
     ax.axhspan(25, 30, color='#f39c12', alpha=0.1)
@@ -158,16 +276,169 @@ def create_history_chart(history):
     ax.set_ylabel('BMI')
     ax.set_title('BMI History')
     ax.grid(True, linestyle='--', alpha=0.7)
-
-    plt.tight_layout()
-    return fig
+    return fig, line
+
+
+def _set_history_points(fig, line, dates, bmis):
+    """Point the chart line at the (downsampled) history and rescale the axes"""
+    kept = lttb(dates.astype(np.int64), bmis, MAX_CHART_POINTS)
+    line.set_data(dates[kept], bmis[kept])
+    ax = line.axes
+    ax.relim()
+    ax.autoscale_view()
+    fig.tight_layout()
+
+
+class HistoryChartCache:
+    """Keeps one history figure per user and updates it in place.
+
+    Figures are keyed on the store's history generation. While it is
+    unchanged, only entries added since the figure was drawn are fetched,
+    in the same read as the generation and count, and appended. After a
+    clear, even one made from another session, the chart is rebuilt. The
+    least recently used figures beyond max_size are closed.
+    """
+
+    def __init__(self, max_size=CHART_CACHE_SIZE):
+        self.max_size = max_size
+        self._charts = OrderedDict()  # user -> [generation, count, dates, bmis, fig, line]
+        self._lock = threading.Lock()
+
+    def get(self, store, user):
+        with self._lock:
+            chart = self._charts.get(user)
+            generation, count, history = store.entries_since(user, chart[1] if chart is not None else 0)
+            if chart is not None and (chart[0] != generation or chart[1] > count):
+                plt.close(chart[4])
+                del self._charts[user]
+                chart = None
+                generation, count, history = store.entries_since(user, 0)
+            if count == 0:
+                return None
+
+            if chart is None:
+                fig, line = _new_history_figure()
+                chart = [generation, 0, np.empty(0, dtype="datetime64[s]"), np.empty(0), fig, line]
+                self._charts[user] = chart
+            self._charts.move_to_end(user)
+
+            if history:
+                chart[2] = np.concatenate([chart[2], np.array([e["date"] for e in history], dtype="datetime64[s]")])
+                chart[3] = np.concatenate([chart[3], np.array([e["bmi"] for e in history], dtype=np.float64)])
+                chart[1] = len(chart[2])
+                _set_history_points(chart[4], chart[5], chart[2], chart[3])
+
+            while len(self._charts) > self.max_size:
+                _, evicted = self._charts.popitem(last=False)
+                plt.close(evicted[4])
+            return chart[4]
+
+
+@st.cache_resource
+def get_history_chart_cache():
+    """Share one chart cache between reruns and sessions"""
+    return HistoryChartCache()
+
+
+def screen_chunk(df, weight_col="weight", height_col="height", units_col="units", units="metric"):
+    """Add bmi, category and color columns to one chunk of records"""
+    unit_values = df[units_col].to_numpy() if units_col in df.columns else units
+    bmi, codes, colors = calculate_bmi_batch(df[weight_col].to_numpy(), df[height_col].to_numpy(),
+                                             unit_values)
+    df = df.copy()
+    # Keep the measurement dtypes the same in every chunk, whether or not it has decimals or blanks
+    df[weight_col] = df[weight_col].astype("float64")
+    df[height_col] = df[height_col].astype("float64")
+    df["bmi"] = bmi
+    df["category"] = np.where(codes >= 0, np.array([name for name, _ in BMI_CATEGORIES])[codes], "")
+    df["color"] = colors
+    return df
+
+
+def iter_chunks(path, chunk_size, numeric_columns=()):
+    """Yield DataFrame chunks of at most chunk_size rows from a CSV or Parquet file.
+
+    CSV columns are read as text, except numeric_columns as float64, so a
+    column that is blank for a whole chunk keeps the type of the others.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        dtype = defaultdict(lambda: str, {column: "float64" for column in numeric_columns})
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=dtype)
+
+
+def screen_file(input_path, output_path, chunk_size=100_000, **columns):
+    """Stream records from input_path, compute BMIs and write them to output_path.
+
+    Only one chunk is held in memory at a time, so peak memory depends on
+    chunk_size rather than on the file size. Returns (rows, seconds).
+    """
+    parquet_out = output_path.endswith(".parquet")
+    if parquet_out:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    start = time.perf_counter()
+    rows = 0
+    writer = None
+    try:
+        numeric_columns = (columns.get("weight_col", "weight"), columns.get("height_col", "height"))
+        for chunk in iter_chunks(input_path, chunk_size, numeric_columns):
+            chunk = screen_chunk(chunk, **columns)
+            if parquet_out:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(output_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, time.perf_counter() - start
+
+
+def screen_main(argv=None):
+    """Command line entry point for headless BMI screening"""
+    parser = argparse.ArgumentParser(description="Compute BMI and category for every row of a CSV or Parquet file.")
+    parser.add_argument("input", help="input .csv or .parquet file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per chunk (default: 100000)")
+    parser.add_argument("--weight-col", default="weight")
+    parser.add_argument("--height-col", default="height")
+    parser.add_argument("--units-col", default="units",
+                        help="per-row unit system column; --units is used when it is missing")
+    parser.add_argument("--units", choices=["metric", "imperial"], default="metric")
+    args = parser.parse_args(argv)
+
+    rows, seconds = screen_file(args.input, args.output, args.chunk_size, weight_col=args.weight_col,
+                                height_col=args.height_col, units_col=args.units_col, units=args.units)
+    rate = rows / seconds if seconds else float("inf")
+    print(f"Screened {rows} rows in {seconds:.2f}s ({rate:,.0f} rows/s)", file=sys.stderr)
 
 
 # Main application
 def main():
+    setup_page()
+
     # Sidebar inputs
     st.sidebar.title("BMI Calculator")
 
+    # History is private to this browser session, and kept only in its memory, unless a profile is named
+    if "session_profile" not in st.session_state:
+        st.session_state.session_profile = f"session:{uuid.uuid4().hex}"
+    profile = st.sidebar.text_input("Profile", value="", placeholder="Private to this session",
+                                    help="Name a profile to keep history across sessions. "
+                                         "Anyone who enters the same name shares it.").strip()
+    user = profile or st.session_state.session_profile
+    user_store = get_history_store() if profile else get_session_history_store()
+
     # Unit selection
     units = st.sidebar.radio("Select Units", ["Metric (kg, cm)", "Imperial (lb, in)"])
 
@@ -201,7 +472,7 @@ def main():
     calculate_button = st.sidebar.button("Calculate BMI", type="primary")
 
     # Load history data
-    bmi_history = load_user_data()
+    history_store, history_count = load_user_data(user, user_store)
 
     # Main content area
     st.title("BMI Calculator Dashboard")
@@ -209,17 +480,17 @@ def main():
     tabs = st.tabs(["Calculator", "History", "Information"])
 
     with tabs[0]:
-        if calculate_button or len(bmi_history) > 0:
+        if calculate_button or history_count > 0:
             # Calculate BMI
             if calculate_button:
                 bmi = calculate_bmi(weight, height, unit_system)
                 category, color = get_bmi_category(bmi)
 
                 # Save calculation
-                save_bmi_calculation(weight, height, bmi, unit_system)
+                save_bmi_calculation(weight, height, bmi, unit_system, user, history_store)
             else:
                 # Display most recent calculation
-                latest = bmi_history[-1]
+                latest = history_store.latest(user)
                 bmi = latest["bmi"]
                 category, color = get_bmi_category(bmi)
 
@@ -290,21 +561,26 @@ def main():
     with tabs[1]:
         st.subheader("BMI History")
 
-        if not bmi_history:
+        if history_count == 0 and not calculate_button:
             st.info("No BMI calculations saved yet. Calculate your BMI to start tracking.")
         else:
             # Show history chart
-            history_chart = create_history_chart(bmi_history)
+            history_chart = get_history_chart_cache().get(history_store, user)
             if history_chart:
                 st.pyplot(history_chart)
 
-            # Show history table
-            df = pd.DataFrame(bmi_history)
+            # Show history table one page at a time, newest first
+            page_size = 20
+            history_count = history_store.count(user)
+            page_count = max((history_count + page_size - 1) // page_size, 1)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+            df = pd.DataFrame(history_store.page(user, page - 1, page_size))
             st.dataframe(df, use_container_width=True)
+            st.caption(f"Page {page} of {page_count} ({history_count} entries)")
 
             # Clear history button
             if st.button("Clear History"):
-                st.session_state.bmi_history = []
+                history_store.clear(user)
                 st.experimental_rerun()
 
     with tabs[2]:
@@ -331,4 +607,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `python bmi.py screen in.csv out.csv` runs headless; `streamlit run bmi.py` starts the dashboard
+    if len(sys.argv) > 1 and sys.argv[1] == "screen":
+        screen_main(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,205 @@
+# history_store.py - Storage backends for BMI history
+import bisect
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+HISTORY_FIELDS = ["date", "weight", "height", "units", "bmi", "category"]
+
+
+class HistoryStore:
+    """Interface shared by the history backends.
+
+    Entries are dicts with the keys in HISTORY_FIELDS. Dates are
+    "YYYY-MM-DD HH:MM:SS" strings, which sort the same way as the times
+    they represent, so range bounds can be compared as plain strings.
+    """
+
+    def append(self, user, entry):
+        """Store one entry for user without touching earlier entries."""
+        raise NotImplementedError
+
+    def range(self, user, start=None, end=None):
+        """Return entries with start <= date < end, oldest first."""
+        raise NotImplementedError
+
+    def page(self, user, page, page_size=20):
+        """Return one page of entries, newest first. Pages start at 0."""
+        raise NotImplementedError
+
+    def count(self, user):
+        """Return the number of entries stored for user."""
+        raise NotImplementedError
+
+    def clear(self, user):
+        """Delete every entry stored for user."""
+        raise NotImplementedError
+
+    def entries_since(self, user, known):
+        """Return (generation, count, entries after the first known ones, oldest first).
+
+        All three are read at one point in time. The generation goes up
+        every time the history is cleared, so an unchanged generation with
+        a higher count means entries were only added since the last call.
+        """
+        raise NotImplementedError
+
+    def latest(self, user):
+        """Return the most recent entry for user, or None."""
+        entries = self.page(user, 0, 1)
+        return entries[0] if entries else None
+
+
+class MemoryHistoryStore(HistoryStore):
+    """Keeps entries in process memory, sorted by date. Lost on restart."""
+
+    def __init__(self):
+        self._entries = {}  # user -> list of entries sorted by date
+        self._dates = {}  # user -> list of dates, parallel to _entries
+        self._generations = {}  # user -> number of times cleared
+        self._lock = threading.Lock()
+
+    def append(self, user, entry):
+        with self._lock:
+            dates = self._dates.setdefault(user, [])
+            pos = bisect.bisect_right(dates, entry["date"])
+            dates.insert(pos, entry["date"])
+            self._entries.setdefault(user, []).insert(pos, dict(entry))
+
+    def range(self, user, start=None, end=None):
+        dates = self._dates.get(user, [])
+        lo = 0 if start is None else bisect.bisect_left(dates, start)
+        hi = len(dates) if end is None else bisect.bisect_left(dates, end)
+        return self._entries.get(user, [])[lo:hi]
+
+    def page(self, user, page, page_size=20):
+        entries = self._entries.get(user, [])
+        end = len(entries) - page * page_size
+        return entries[max(end - page_size, 0):max(end, 0)][::-1]
+
+    def count(self, user):
+        return len(self._dates.get(user, []))
+
+    def clear(self, user):
+        with self._lock:
+            self._entries.pop(user, None)
+            self._dates.pop(user, None)
+            self._generations[user] = self._generations.get(user, 0) + 1
+
+    def entries_since(self, user, known):
+        with self._lock:
+            entries = self._entries.get(user, [])
+            return self._generations.get(user, 0), len(entries), entries[known:]
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """Keeps entries in an SQLite file indexed on (user, date).
+
+    Each append is a single-row INSERT committed on its own, so past
+    entries are never rewritten and a crash loses at most the write in
+    progress. A new connection is opened per call, which keeps the store
+    safe to share between Streamlit sessions running in different threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bmi_history (
+                    id INTEGER PRIMARY KEY,
+                    user TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    weight REAL,
+                    height REAL,
+                    units TEXT,
+                    bmi REAL,
+                    category TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bmi_history_user_date ON bmi_history (user, date)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bmi_history_generation (
+                    user TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _query(self, sql, params):
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def append(self, user, entry):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO bmi_history (user, date, weight, height, units, bmi, category) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [user] + [entry[field] for field in HISTORY_FIELDS],
+            )
+
+    def range(self, user, start=None, end=None):
+        sql = f"SELECT {', '.join(HISTORY_FIELDS)} FROM bmi_history WHERE user = ?"
+        params = [user]
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND date < ?"
+            params.append(end)
+        return self._query(sql + " ORDER BY date, id", params)
+
+    def page(self, user, page, page_size=20):
+        return self._query(
+            f"SELECT {', '.join(HISTORY_FIELDS)} FROM bmi_history WHERE user = ? "
+            "ORDER BY date DESC, id DESC LIMIT ? OFFSET ?",
+            [user, page_size, page * page_size],
+        )
+
+    def count(self, user):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM bmi_history WHERE user = ?", [user]).fetchone()[0]
+
+    def clear(self, user):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM bmi_history WHERE user = ?", [user])
+            conn.execute(
+                "INSERT INTO bmi_history_generation (user, generation) VALUES (?, 1) "
+                "ON CONFLICT (user) DO UPDATE SET generation = generation + 1",
+                [user],
+            )
+
+    def entries_since(self, user, known):
+        with closing(self._connect()) as conn:
+            # One read transaction, so the entries match the generation and count read with them
+            conn.execute("BEGIN")
+            generation, count = conn.execute(
+                "SELECT COALESCE((SELECT generation FROM bmi_history_generation WHERE user = ?), 0), "
+                "(SELECT COUNT(*) FROM bmi_history WHERE user = ?)",
+                [user, user],
+            ).fetchone()
+            entries = [dict(row) for row in conn.execute(
+                f"SELECT {', '.join(HISTORY_FIELDS)} FROM bmi_history WHERE user = ? "
+                "ORDER BY date, id LIMIT -1 OFFSET ?",
+                [user, known],
+            )]
+            conn.rollback()
+        return generation, count, entries
+
+
+def open_history_store(location=None):
+    """Open the backend named by location or the BMI_HISTORY_DB environment variable.
+
+    ":memory:" selects MemoryHistoryStore; anything else is an SQLite file
+    path. The default is bmi_history.db next to this module.
+    """
+    location = location or os.environ.get(
+        "BMI_HISTORY_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bmi_history.db"))
+    if location == ":memory:":
+        return MemoryHistoryStore()
+    return SQLiteHistoryStore(location)
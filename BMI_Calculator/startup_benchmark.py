@@ -0,0 +1,75 @@
+# startup_benchmark.py - Measure cold-start time of the BMI dashboard
+"""Report import time and first-render time for one or more versions of bmi.py.
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported. To compare before and after a change, export the old version
+next to the current one and pass both:
+
+    git show HEAD~1:BMI_Calculator/bmi.py > BMI_Calculator/bmi_before.py
+    python BMI_Calculator/startup_benchmark.py BMI_Calculator/bmi_before.py BMI_Calculator/bmi.py
+
+With --budget the script exits with status 1 when the last script's
+first render takes longer than the given number of seconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib.pyplot", "plotly.graph_objects"]
+
+# Runs inside the child interpreter: import the script as a module, then
+# render it once with Streamlit's headless test runner.
+CHILD_CODE = """
+import importlib.util, json, os, sys, time
+path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(path))
+sys.argv = [path]
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("bmi_under_test", path)
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+import_time = time.perf_counter() - start
+loaded = [name for name in json.loads(os.environ["HEAVY_MODULES"]) if name in sys.modules]
+
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(path, default_timeout=60)
+start = time.perf_counter()
+app.run()
+render_time = time.perf_counter() - start
+print(json.dumps({"import": import_time, "render": render_time, "loaded": loaded}))
+"""
+
+
+def measure(path, env):
+    """Run one cold import + first render of path and return the child's report"""
+    result = subprocess.run([sys.executable, "-c", CHILD_CODE, path], env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the BMI dashboard.")
+    parser.add_argument("scripts", nargs="*", default=[os.path.join(os.path.dirname(__file__), "bmi.py")])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per script (default: 5)")
+    parser.add_argument("--budget", type=float, help="fail if the last script's median first render exceeds this")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, HEAVY_MODULES=json.dumps(HEAVY_MODULES), BMI_HISTORY_DB=":memory:")
+    render = None
+    for path in args.scripts:
+        reports = [measure(os.path.abspath(path), env) for _ in range(args.runs)]
+        imported = statistics.median(r["import"] for r in reports)
+        render = statistics.median(r["render"] for r in reports)
+        print(f"{path}: import {imported * 1000:.0f} ms, first render {render * 1000:.0f} ms "
+              f"(median of {args.runs}); heavy modules at import: {', '.join(reports[0]['loaded']) or 'none'}")
+
+    if args.budget is not None and render > args.budget:
+        print(f"First render {render:.2f}s is over the {args.budget:.2f}s budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
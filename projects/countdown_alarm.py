@@ -0,0 +1,159 @@
+# countdown_alarm.py - Alarm sounds for the countdown timers
+"""Non-blocking alarms on Windows, Linux and macOS, or silently.
+
+The alarm tone is rendered once into a WAV buffer and reused for every
+ring. Rings are handed to one shared worker thread; rings that arrive
+while an alarm is already waiting or playing are merged into it, so a
+hundred timers ending together play one alarm instead of starting a
+hundred threads.
+
+The backend is picked from the COUNTDOWN_ALARM environment variable
+("winsound", "command" or "null"), or from the platform by default.
+"""
+import array
+import atexit
+import io
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+
+SAMPLE_RATE = 22050
+FREQUENCY = 1000  # Hz
+BEEP_SECONDS = 0.2  # Each beep is followed by a short pause
+PAUSE_SECONDS = 0.05
+BEEPS = 20  # About 5 seconds in all
+VOLUME = 0.5
+PLAYERS = [["aplay", "-q"], ["paplay"], ["pw-play"], ["afplay"]]  # Tried in order by CommandBackend
+
+
+def render_tone(frequency=FREQUENCY, beeps=BEEPS):
+    """Return the alarm as 16-bit mono WAV bytes"""
+    beep = array.array("h", (int(VOLUME * 32767 * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE))
+                             for i in range(int(BEEP_SECONDS * SAMPLE_RATE))))
+    if sys.byteorder == "big":
+        beep.byteswap()
+    pattern = beep.tobytes() + bytes(2 * int(PAUSE_SECONDS * SAMPLE_RATE))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pattern * beeps)
+    return buffer.getvalue()
+
+
+class AlarmBackend:
+    """Plays the alarm once, blocking until it is done."""
+
+    def play(self):
+        raise NotImplementedError
+
+
+class NullBackend(AlarmBackend):
+    """Plays nothing; counts plays, for headless use and tests."""
+
+    def __init__(self):
+        self.plays = 0
+
+    def play(self):
+        self.plays += 1
+
+
+class WinsoundBackend(AlarmBackend):
+    """Plays the rendered tone from memory with winsound (Windows)."""
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+        self._tone = render_tone()
+
+    def play(self):
+        self._winsound.PlaySound(self._tone, self._winsound.SND_MEMORY)
+
+
+class CommandBackend(AlarmBackend):
+    """Plays the rendered tone with a command line player (aplay, paplay, pw-play or afplay).
+
+    The tone is written to a temporary WAV file once, when the backend is
+    created, and removed when the program exits.
+    """
+
+    def __init__(self, command=None):
+        if command is None:
+            command = next((player for player in PLAYERS if shutil.which(player[0])), None)
+            if command is None:
+                raise RuntimeError("no audio player found; install alsa-utils or set COUNTDOWN_ALARM=null")
+        fd, self.path = tempfile.mkstemp(prefix="countdown_alarm_", suffix=".wav")
+        with os.fdopen(fd, "wb") as f:
+            f.write(render_tone())
+        atexit.register(os.remove, self.path)
+        self.command = list(command) + [self.path]
+
+    def play(self):
+        subprocess.run(self.command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+
+
+def open_backend(name=None):
+    """Create the backend called name, or the platform's default"""
+    name = name or os.environ.get("COUNTDOWN_ALARM")
+    if name == "null":
+        return NullBackend()
+    if name == "winsound" or (name is None and sys.platform == "win32"):
+        return WinsoundBackend()
+    if name not in (None, "command"):
+        raise ValueError(f"unknown alarm backend {name!r}")
+    try:
+        return CommandBackend()
+    except RuntimeError:
+        if name == "command":
+            raise
+        return NullBackend()
+
+
+class Alarm:
+    """Rings a backend from a single worker thread, merging overlapping rings."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._requested = False
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def ring(self):
+        """Ask for the alarm to play; returns at once"""
+        with self._condition:
+            self._requested = True
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="countdown-alarm", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._requested:
+                    self._condition.wait()
+                self._requested = False
+            try:
+                self.backend.play()
+            except Exception as e:  # A broken sound device must not stop later alarms
+                print(f"Alarm failed: {e}", file=sys.stderr)
+
+
+_alarm = None
+_alarm_lock = threading.Lock()
+
+
+def get_alarm():
+    """Return the process-wide Alarm, creating it on first use"""
+    global _alarm
+    with _alarm_lock:
+        if _alarm is None:
+            _alarm = Alarm(open_backend())
+        return _alarm
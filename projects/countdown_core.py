@@ -0,0 +1,210 @@
+# countdown_core.py - Countdown timing, independent of any GUI
+"""A countdown is a deadline on a monotonic clock, not a counter.
+
+Decrementing a counter once per scheduled callback loses the callback's
+latency on every tick, so long timers fall behind real time. Countdown
+instead computes the remaining time from its deadline whenever asked,
+and tells its caller how long to wait until the displayed whole second
+next changes.
+
+TimerManager runs many named countdowns from one wakeup: a min-heap holds
+each running countdown's next display change, so the caller only ever
+waits for the earliest one.
+"""
+import heapq
+import itertools
+import math
+import time
+
+
+class Countdown:
+    """One countdown of a number of seconds, which can be paused and reset.
+
+    clock is any function returning seconds that never go backwards;
+    tests and simulations pass a fake one.
+    """
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self.clock = clock
+        self.duration = seconds  # Restored by reset()
+        self.deadline = None  # Clock time the countdown ends, while running
+        self._remaining = seconds  # Time left, while paused
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def remaining(self):
+        """Return the seconds left, never below 0"""
+        if self.deadline is None:
+            return self._remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def display_seconds(self):
+        """Return the whole seconds to show: 120 until a second has passed, then 119, ..."""
+        return math.ceil(self.remaining())
+
+    def start(self):
+        if self.deadline is None:
+            self.deadline = self.clock() + self._remaining
+
+    def pause(self):
+        if self.deadline is not None:
+            self._remaining = self.remaining()
+            self.deadline = None
+
+    def reset(self):
+        """Stop and go back to the full duration"""
+        self.deadline = None
+        self._remaining = self.duration
+
+    def adjust(self, seconds):
+        """Add seconds (or take them away, if negative) to both the duration and the time left.
+
+        Taking away more than either has left sets both to 0.
+        """
+        remaining = self.remaining()
+        if seconds < 0 and (remaining + seconds < 0 or self.duration + seconds < 0):
+            self.duration = 0
+            remaining = 0
+        else:
+            self.duration += seconds
+            remaining += seconds
+        if self.deadline is None:
+            self._remaining = remaining
+        else:
+            self.deadline = self.clock() + remaining
+
+    def tick(self):
+        """Return (display seconds, seconds until the display next changes).
+
+        The delay is None once the countdown has finished, which also
+        stops it. Waiting exactly the returned delay keeps ticks on the
+        second boundaries, however late the previous tick ran.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.deadline = None
+            self._remaining = 0
+            return 0, None
+        shown = math.ceil(remaining)
+        return shown, remaining - (shown - 1)
+
+
+class TimerManager:
+    """Named countdowns sharing one clock and one wakeup.
+
+    The heap holds [time, sequence, name] for the next display change of
+    each running countdown; its last change is the expiry. Pausing,
+    resetting or cancelling a countdown blanks its entry's name instead of
+    searching the heap, so every operation is O(log n). Blank entries are
+    dropped when they reach the top, or all at once when they outnumber
+    live ones.
+
+    With ticks=False, only countdowns passed to watch() wake at every
+    display change; the rest wake once, when they expire.
+    """
+
+    def __init__(self, clock=time.monotonic, ticks=True):
+        self.clock = clock
+        self.ticks = ticks
+        self.watched = set()
+        self.timers = {}
+        self._heap = []
+        self._entries = {}  # name -> its live heap entry
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, name):
+        return name in self.timers
+
+    def add(self, name, seconds, start=True):
+        """Add a countdown, replacing any with the same name, and return it"""
+        self.cancel(name)
+        timer = self.timers[name] = Countdown(seconds, self.clock)
+        if start:
+            self.resume(name)
+        return timer
+
+    def cancel(self, name):
+        """Remove a countdown; unknown names are ignored"""
+        self._unschedule(name)
+        self.timers.pop(name, None)
+        self.watched.discard(name)
+
+    def watch(self, name, watched=True):
+        """Choose whether a countdown wakes at every display change when ticks is off"""
+        if watched:
+            self.watched.add(name)
+        else:
+            self.watched.discard(name)
+        if self.timers[name].running:
+            self._unschedule(name)
+            self._schedule(name)
+
+    def pause(self, name):
+        self._unschedule(name)
+        self.timers[name].pause()
+
+    def resume(self, name):
+        timer = self.timers[name]
+        if not timer.running:
+            timer.start()
+            self._schedule(name)
+
+    def reset(self, name):
+        """Stop a countdown and restore its full duration"""
+        self._unschedule(name)
+        self.timers[name].reset()
+
+    def adjust(self, name, seconds):
+        timer = self.timers[name]
+        timer.adjust(seconds)
+        if timer.running:
+            self._unschedule(name)
+            self._schedule(name)
+
+    def next_wakeup(self):
+        """Return the clock time of the next display change or expiry, or None if nothing is running"""
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def poll(self):
+        """Process every event that is due.
+
+        Returns (changed, expired): the names whose displayed seconds
+        changed, and those of them that reached 0 and stopped.
+        """
+        now = self.clock()
+        heap = self._heap
+        changed, expired = [], []
+        while heap and heap[0][0] <= now:
+            _, _, name = heapq.heappop(heap)
+            if name is None:
+                continue
+            del self._entries[name]
+            changed.append(name)
+            if self.timers[name].tick()[1] is None:
+                expired.append(name)
+            else:
+                self._schedule(name)
+        return changed, expired
+
+    def _schedule(self, name):
+        timer = self.timers[name]
+        delay = timer.tick()[1] if self.ticks or name in self.watched else timer.remaining() or None
+        when = self.clock() + (0 if delay is None else delay)
+        entry = self._entries[name] = [when, next(self._sequence), name]
+        heapq.heappush(self._heap, entry)
+
+    def _unschedule(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            entry[2] = None
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [e for e in self._heap if e[2] is not None]
+                heapq.heapify(self._heap)
@@ -0,0 +1,176 @@
+# countdown_drift.py - Measure countdown drift against a simulated clock
+"""Simulate long countdowns on a fake clock whose callbacks run late.
+
+    python countdown_drift.py --hours 1 --latency-ms 5 --stall-ms 250
+
+Two schedulers are compared under the same callback latency:
+
+- deadline: a real CountdownTimer with stub widgets, whose countdown()
+  wakes at each second boundary of its deadline
+- naive: the old loop, taking one second off a counter per 1000 ms callback
+
+and for each the report shows when the display reached 00:00 relative to
+the true deadline, how late second changes were shown, and how many ticks
+and label updates it took. No real time passes, so an hour runs in
+about a second.
+"""
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import types
+
+import countdown_timer
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeLoop:
+    """Runs after() callbacks in simulated time, each some random latency late.
+
+    A FakeLoop can stand in for the tkinter master of a CountdownTimer.
+    """
+
+    def __init__(self, clock, latency, stall, stall_chance, seed):
+        self.clock = clock
+        self.latency = latency
+        self.stall = stall
+        self.stall_chance = stall_chance
+        self.rng = random.Random(seed)
+        self.queue = []
+        self.order = itertools.count()
+        self.cancelled = set()
+
+    def after(self, ms, callback):
+        late = self.rng.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+        if self.rng.random() < self.stall_chance:
+            late += self.stall
+        callback_id = next(self.order)
+        heapq.heappush(self.queue, (self.clock.now + ms / 1000 + late, callback_id, callback))
+        return callback_id
+
+    def after_cancel(self, callback_id):
+        self.cancelled.add(callback_id)
+
+    def run(self):
+        while self.queue:
+            when, callback_id, callback = heapq.heappop(self.queue)
+            if callback_id in self.cancelled:
+                self.cancelled.discard(callback_id)
+                continue
+            self.clock.now = when
+            callback()
+
+
+class StubWidget:
+    """Accepts the tkinter widget calls CountdownTimer makes and ignores them."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def pack(self, **kwargs):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+
+STUB_TK = types.SimpleNamespace(Label=StubWidget, Frame=StubWidget, Button=StubWidget, LEFT="left")
+
+
+def make_timer(master, seconds, clock):
+    """Build a CountdownTimer whose widgets are StubWidgets"""
+    real_tk = countdown_timer.tk
+    countdown_timer.tk = STUB_TK
+    try:
+        return countdown_timer.CountdownTimer(master, seconds, clock)
+    finally:
+        countdown_timer.tk = real_tk
+
+
+def run_deadline(seconds, loop, clock):
+    """Run a CountdownTimer on loop; returns (finish time, second-change lags, ticks, renders)"""
+    timer = make_timer(loop, seconds, clock)
+    state = {"ticks": 0, "finished": None}
+    lags = []
+    tick = timer.timer.tick
+
+    def counted_tick():
+        state["ticks"] += 1
+        return tick()
+
+    def config(**kwargs):
+        # The display should have changed when the deadline was shown seconds away
+        lags.append(clock.now - (start + seconds - timer.shown))
+
+    def finished():
+        state["finished"] = clock.now
+
+    timer.timer.tick = counted_tick
+    timer.label.config = config
+    timer.play_alarm = finished
+    start = clock.now
+    timer.start()
+    loop.run()
+    return state["finished"] - start, lags, state["ticks"], len(lags)
+
+
+def run_naive(seconds, loop, clock):
+    """Run the old counter-based loop; returns (finish time, second-change lags, ticks, renders)"""
+    state = {"count": seconds, "ticks": 0, "finished": None}
+    lags = []
+
+    def countdown():
+        state["ticks"] += 1
+        if state["count"] < seconds:
+            lags.append(clock.now - (start + seconds - state["count"]))
+        if state["count"] > 0:
+            state["count"] -= 1
+            loop.after(1000, countdown)
+        else:
+            state["finished"] = clock.now
+
+    start = clock.now
+    countdown()
+    loop.run()
+    return state["finished"] - start, lags, state["ticks"], state["ticks"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure countdown drift under simulated callback latency.")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="mean callback latency")
+    parser.add_argument("--stall-ms", type=float, default=250.0, help="extra delay of an occasional stalled callback")
+    parser.add_argument("--stall-chance", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    seconds = round(args.hours * 3600)
+    print(f"{seconds} s countdown, {args.latency_ms:g} ms mean latency, "
+          f"{args.stall_chance:.0%} of callbacks {args.stall_ms:g} ms later still")
+    worst = 0.0
+    for name, run in (("deadline", run_deadline), ("naive", run_naive)):
+        clock = FakeClock()
+        loop = FakeLoop(clock, args.latency_ms / 1000, args.stall_ms / 1000, args.stall_chance, args.seed)
+        finished, lags, ticks, renders = run(seconds, loop, clock)
+        drift = finished - seconds
+        print(f"{name:>9}: finished {drift * 1000:+10.1f} ms vs deadline, second changes late by "
+              f"{sum(lags) / max(len(lags), 1) * 1000:.1f} ms on average and {max(lags, default=0) * 1000:.1f} ms "
+              f"at most, {ticks} ticks, {renders} label updates")
+        if name == "deadline":
+            worst = max(lags, default=0)
+    # Without drift, no second change is later than one slow callback
+    return 0 if worst <= (args.stall_ms + 20 * args.latency_ms) / 1000 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
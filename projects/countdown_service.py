@@ -0,0 +1,183 @@
+# countdown_service.py - Countdown timers for asyncio programs
+"""Run countdowns from services and scripts, without a GUI.
+
+    async def main():
+        timers = TimerService()
+        timers.add("tea", 180)
+        async for seconds in timers.ticks("tea"):
+            print(seconds)
+        await timers.wait("tea")
+
+The timers are the same TimerManager the Tk dashboard uses. One loop
+callback is pending at a time, for the earliest event of any timer, and
+timers nobody iterates over only wake when they expire, so thousands of
+timers cost almost nothing between expirations. Try it with:
+
+    python countdown_service.py 5000 --seconds 10
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from countdown_core import TimerManager
+
+_END = object()  # Queued to a tick iterator when its timer expires
+
+
+class TimerService:
+    """Named countdowns on the running asyncio event loop.
+
+    wait() and ticks() raise asyncio.CancelledError if the timer is
+    cancelled while they wait; pausing only delays them.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.manager = TimerManager(clock, ticks=False)
+        self._waiters = {}  # Timer name -> futures resolved when it expires
+        self._listeners = {}  # Timer name -> queues fed by ticks()
+        self._handle = None
+        self._handle_at = None
+
+    @property
+    def timers(self):
+        return self.manager.timers
+
+    def add(self, name, seconds, start=True):
+        """Add a countdown, cancelling any with the same name, and return it"""
+        if name in self.manager:
+            self.cancel(name)
+        timer = self.manager.add(name, seconds, start)
+        self._schedule()
+        return timer
+
+    def cancel(self, name):
+        """Remove a countdown; its waiters and tick iterators get CancelledError"""
+        self.manager.cancel(name)
+        for future in self._waiters.pop(name, []):
+            future.cancel()
+        for queue in self._listeners.pop(name, []):
+            queue.put_nowait(asyncio.CancelledError)
+
+    def pause(self, name):
+        self.manager.pause(name)
+
+    def resume(self, name):
+        self.manager.resume(name)
+        self._schedule()
+
+    def reset(self, name):
+        self.manager.reset(name)
+
+    def adjust(self, name, seconds):
+        self.manager.adjust(name, seconds)
+        self._schedule()
+
+    async def wait(self, name):
+        """Wait until the countdown called name reaches 0"""
+        timer = self.manager.timers[name]
+        if not timer.running and timer.remaining() <= 0:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(name, []).append(future)
+        try:
+            await future
+        finally:
+            waiters = self._waiters.get(name)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[name]
+
+    async def ticks(self, name):
+        """Yield the displayed seconds each time they change, ending after 0
+
+        A timer that is already stopped at 0 yields 0 once, as wait() returns at once.
+        """
+        timer = self.manager.timers[name]
+        queue = asyncio.Queue()
+        listeners = self._listeners.setdefault(name, [])
+        listeners.append(queue)
+        if len(listeners) == 1:
+            self.manager.watch(name)
+            self._schedule()
+        try:
+            yield timer.display_seconds()
+            if not timer.running and timer.remaining() <= 0:
+                return
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+                if item is asyncio.CancelledError:
+                    raise asyncio.CancelledError
+                yield item
+        finally:
+            listeners = self._listeners.get(name)
+            if listeners and queue in listeners:
+                listeners.remove(queue)
+                if not listeners:
+                    del self._listeners[name]
+                    if name in self.manager:
+                        self.manager.watch(name, False)
+
+    def _schedule(self):
+        wakeup = self.manager.next_wakeup()
+        if self._handle is not None:
+            if wakeup is not None and self._handle_at <= wakeup:
+                return
+            self._handle.cancel()
+            self._handle = None
+        if wakeup is not None:
+            delay = max(wakeup - self.manager.clock(), 0)
+            self._handle = asyncio.get_running_loop().call_later(delay, self._wake)
+            self._handle_at = wakeup
+
+    def _wake(self):
+        self._handle = None
+        changed, expired = self.manager.poll()
+        for name in changed:
+            if name in self._listeners:
+                seconds = self.manager.timers[name].display_seconds()
+                for queue in self._listeners[name]:
+                    queue.put_nowait(seconds)
+        for name in expired:
+            for future in self._waiters.pop(name, []):
+                if not future.done():
+                    future.set_result(None)
+            for queue in self._listeners.get(name, []):
+                queue.put_nowait(_END)
+        self._schedule()
+
+
+async def run_many(count, seconds):
+    """Start count timers ending within seconds; returns (worst lateness, CPU seconds)"""
+    service = TimerService()
+    cpu = time.process_time()
+    lateness = []
+
+    async def one(i):
+        duration = seconds * (i + 1) / count
+        deadline = service.manager.clock() + duration
+        service.add(i, duration)
+        await service.wait(i)
+        lateness.append(service.manager.clock() - deadline)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return max(lateness), time.process_time() - cpu
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many countdowns in one event loop and report the cost.")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seconds", type=float, default=10.0, help="the last timer ends after this long")
+    args = parser.parse_args(argv)
+
+    late, cpu = asyncio.run(run_many(args.count, args.seconds))
+    print(f"{args.count} timers over {args.seconds:g}s: latest expiry {late * 1000:.1f} ms after its deadline, "
+          f"{cpu:.3f}s CPU ({cpu / args.seconds:.1%} of one core)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,32 @@
 import tkinter as tk
-import threading
-import winsound  # Windows only; for cross-platform usage consider other libraries
+import math
+import sys
+import time
+
+from countdown_alarm import get_alarm
+from countdown_core import Countdown, TimerManager
+
+
+def format_time(seconds):
+    """Convert seconds into a MM:SS formatted string."""
+    minutes, sec = divmod(seconds, 60)
+    return f"{minutes:02d}:{sec:02d}"
+
+
+def play_alarm():
+    """Start the alarm on the shared alarm thread; about 5 seconds of beeps, without blocking."""
+    get_alarm().ring()
 
 
 class CountdownTimer:
-    def __init__(self, master, count):
+    def __init__(self, master, count, clock=time.monotonic):
         self.master = master
-        self.original_count = count  # Stores the initial timer value for reset.
-        self.count = count  # Current time (in seconds).
-        self.running = False  # Indicates if the timer is currently running.
+        self.timer = Countdown(count, clock)  # Tracks the deadline; reset() restores the initial count.
+        self.shown = count  # Seconds currently displayed.
+        self.pending = None  # Id of the scheduled countdown callback, if any.
 
         # Label to display the timer in MM:SS format.
-        self.label = tk.Label(master, text=self.format_time(self.count), font=("Helvetica", 48))
+        self.label = tk.Label(master, text=self.format_time(count), font=("Helvetica", 48))
         self.label.pack(pady=20)
 
         # Frame containing the increase (+) and decrease (-) buttons.
@@ -34,64 +49,182 @@ class CountdownTimer:
 
     def start(self):
         """Starts the countdown if it is not already running."""
-        if not self.running:
-            self.running = True
+        if not self.timer.running:
+            self.timer.start()
             self.countdown()
 
     def reset(self):
         """Stops the countdown and resets the timer to the original count."""
-        self.running = False
-        self.count = self.original_count
-        self.label.config(text=self.format_time(self.count))
+        if self.pending is not None:
+            self.master.after_cancel(self.pending)
+            self.pending = None
+        self.timer.reset()
+        self.show(self.timer.display_seconds())
 
     def increase_timer(self):
         """Increase the timer by 10 seconds."""
-        increment = 10
-        self.count += increment
-        self.original_count += increment
-        self.label.config(text=self.format_time(self.count))
+        self.timer.adjust(10)
+        self.show(self.timer.display_seconds())
 
     def decrease_timer(self):
         """Decrease the timer by 10 seconds, not allowing it to drop below 0."""
-        decrement = 10
-        if self.count - decrement >= 0 and self.original_count - decrement >= 0:
-            self.count -= decrement
-            self.original_count -= decrement
-        else:
-            self.count = 0
-            self.original_count = 0
-        self.label.config(text=self.format_time(self.count))
+        self.timer.adjust(-10)
+        self.show(self.timer.display_seconds())
+
+    def show(self, seconds):
+        """Update the label, unless it already shows seconds."""
+        if seconds != self.shown:
+            self.shown = seconds
+            self.label.config(text=self.format_time(seconds))
 
     def countdown(self):
-        """Update the timer once per second until the count reaches 0."""
-        self.label.config(text=self.format_time(self.count))
-        if self.count > 0 and self.running:
-            self.count -= 1
-            # Schedule the countdown method to run again after 1000 ms (1 second).
-            self.master.after(1000, self.countdown)
+        """Update the timer each time the displayed second changes, until it reaches 0."""
+        seconds, delay = self.timer.tick()
+        self.show(seconds)
+        if delay is not None:
+            # Wake at the next second boundary of the deadline, so late callbacks don't add up.
+            self.pending = self.master.after(math.ceil(delay * 1000), self.countdown)
         else:
-            self.running = False
-            # Timer finished; start the alarm sound in a separate thread.
-            threading.Thread(target=self.play_alarm, daemon=True).start()
+            self.pending = None
+            # Timer finished; sound the alarm.
+            self.play_alarm()
 
     def play_alarm(self):
-        """Play a beep sound repeatedly for 5 seconds when the timer reaches zero."""
-        beep_duration = 250  # Duration of each beep in milliseconds.
-        frequency = 1000  # Frequency of beep in Hz.
-        iterations = 5000 // beep_duration  # Total beeps for approximately 5 seconds.
-        for _ in range(iterations):
-            winsound.Beep(frequency, beep_duration)
+        """Play a beep sound for about 5 seconds when the timer reaches zero."""
+        play_alarm()
 
     def format_time(self, seconds):
         """Convert seconds into a MM:SS formatted string."""
-        minutes, sec = divmod(seconds, 60)
-        return f"{minutes:02d}:{sec:02d}"
+        return format_time(seconds)
+
+
+class TimerDashboard:
+    """Many named timers in one window, such as a kitchen or lab dashboard.
+
+    A TimerManager keeps the timers, and the window schedules one after()
+    callback for the next moment any displayed value changes. Only the
+    labels of timers whose value changed are updated.
+    """
+
+    def __init__(self, master, clock=time.monotonic):
+        self.master = master
+        self.manager = TimerManager(clock)
+        self.rows = {}  # Timer name -> (row frame, time label, start/pause button).
+        self.shown = {}  # Timer name -> text currently displayed.
+        self.pending = None  # Id of the scheduled wake callback, if any.
+        self.pending_at = None  # Clock time the scheduled wake is for.
+        self.next_number = 1  # Number of the next unnamed timer; never reused.
+
+        # Form to add a named timer.
+        add_frame = tk.Frame(master)
+        tk.Label(add_frame, text="Name:").pack(side=tk.LEFT)
+        self.name_entry = tk.Entry(add_frame, width=16)
+        self.name_entry.pack(side=tk.LEFT, padx=5)
+        tk.Label(add_frame, text="Seconds:").pack(side=tk.LEFT)
+        self.seconds_entry = tk.Entry(add_frame, width=6)
+        self.seconds_entry.insert(0, "60")
+        self.seconds_entry.pack(side=tk.LEFT, padx=5)
+        tk.Button(add_frame, text="Add", command=self.add_timer).pack(side=tk.LEFT, padx=5)
+        add_frame.pack(pady=10)
+
+        self.list_frame = tk.Frame(master)
+        self.list_frame.pack(padx=10, pady=10)
+
+    def add_timer(self):
+        """Add and start a timer from the form, replacing one only when its name was typed in."""
+        try:
+            seconds = int(self.seconds_entry.get())
+        except ValueError:
+            return
+        name = self.name_entry.get().strip()
+        if not name:
+            name = self.default_name()
+        elif name in self.rows:
+            self.remove(name)
+        self.manager.add(name, max(seconds, 0))
+
+        row = tk.Frame(self.list_frame)
+        tk.Label(row, text=name, width=16, anchor="w").pack(side=tk.LEFT)
+        time_label = tk.Label(row, font=("Helvetica", 14), width=6)
+        time_label.pack(side=tk.LEFT, padx=5)
+        toggle_button = tk.Button(row, text="Pause", width=6, command=lambda: self.toggle(name))
+        toggle_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(row, text="Reset", command=lambda: self.reset(name)).pack(side=tk.LEFT, padx=2)
+        tk.Button(row, text="Remove", command=lambda: self.remove(name)).pack(side=tk.LEFT, padx=2)
+        row.pack(fill=tk.X)
+        self.rows[name] = (row, time_label, toggle_button)
+        self.render(name)
+        self.schedule()
+
+    def default_name(self):
+        """Return the next "Timer N" name that no timer on the dashboard has."""
+        while True:
+            name = f"Timer {self.next_number}"
+            self.next_number += 1
+            if name not in self.rows:
+                return name
+
+    def toggle(self, name):
+        """Pause a running timer, or start a stopped one."""
+        if self.manager.timers[name].running:
+            self.manager.pause(name)
+        else:
+            self.manager.resume(name)
+        self.render(name)
+        self.schedule()
+
+    def reset(self, name):
+        self.manager.reset(name)
+        self.render(name)
+
+    def remove(self, name):
+        self.manager.cancel(name)
+        self.rows.pop(name)[0].destroy()
+        self.shown.pop(name, None)
+
+    def render(self, name):
+        """Update a timer's row, skipping labels that would not change."""
+        timer = self.manager.timers[name]
+        _, time_label, toggle_button = self.rows[name]
+        text = format_time(timer.display_seconds())
+        if self.shown.get(name) != text:
+            self.shown[name] = text
+            time_label.config(text=text)
+        toggle_button.config(text="Pause" if timer.running else "Start")
+
+    def schedule(self):
+        """Make sure a wake callback is pending for the manager's next event."""
+        wakeup = self.manager.next_wakeup()
+        if self.pending is not None:
+            if wakeup is not None and self.pending_at <= wakeup:
+                return
+            self.master.after_cancel(self.pending)
+            self.pending = None
+        if wakeup is not None:
+            delay = max(wakeup - self.manager.clock(), 0)
+            self.pending = self.master.after(math.ceil(delay * 1000), self.wake)
+            self.pending_at = wakeup
+
+    def wake(self):
+        self.pending = None
+        changed, expired = self.manager.poll()
+        for name in changed:
+            self.render(name)
+        if expired:
+            # One alarm however many timers ended together.
+            play_alarm()
+        self.schedule()
 
 
 if __name__ == '__main__':
-    # Set an initial countdown value, for example, 2 minutes (120 seconds).
-    initial_count = 120
     root = tk.Tk()
-    root.title("Countdown Timer")
-    timer = CountdownTimer(root, initial_count)
+    if sys.argv[1:] == ["dashboard"]:
+        # Many named timers: python countdown_timer.py dashboard
+        root.title("Timer Dashboard")
+        dashboard = TimerDashboard(root)
+    else:
+        # Set an initial countdown value, for example, 2 minutes (120 seconds).
+        initial_count = 120
+        root.title("Countdown Timer")
+        timer = CountdownTimer(root, initial_count)
     root.mainloop()
@@ -0,0 +1,219 @@
+# library_bulk.py - Bulk import and export for the personal library manager
+"""Stream books into or out of the library without going through the UI.
+
+    python library_bulk.py import books.csv
+    python library_bulk.py import books.jsonl --rejects rejected.csv
+    python library_bulk.py import isbns.txt --format isbn --isbn-catalog catalog.csv
+    python library_bulk.py export catalog.jsonl
+
+Imports read records in batches, validate them, skip books whose
+(Title, Author, Year) is already in the library or earlier in the file,
+and store each batch with a single add_books() call.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from library_index import normalize
+from library_storage import COLUMNS, open_library
+
+BATCH_SIZE = 5000  # Records validated and stored per write
+MAX_YEAR = 9999  # Years beyond this, either side of 0, are rejected as typos
+
+
+def read_csv(path):
+    """Yield one dict per CSV row"""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def read_jsonl(path):
+    """Yield one dict per JSON line; unparseable lines and non-objects come back as {"_error": ...}"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {"_error": f"invalid JSON: {e.msg}", "_line": line.strip()}
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    yield {"_error": "not a JSON object", "_line": line.strip()}
+
+
+def isbn_is_valid(isbn):
+    """Check the ISBN-10 or ISBN-13 check digit"""
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] in "xX"):
+        digits = [int(ch) for ch in isbn[:9]] + [10 if isbn[9] in "xX" else int(isbn[9])]
+        return sum((10 - i) * d for i, d in enumerate(digits)) % 11 == 0
+    if len(isbn) == 13 and isbn.isdigit():
+        return sum((3 if i % 2 else 1) * int(ch) for i, ch in enumerate(isbn)) % 10 == 0
+    return False
+
+
+def read_isbns(path, catalog):
+    """Yield book records for an ISBN-per-line file, looked up in catalog.
+
+    The library keeps no ISBN column and there is no network lookup, so
+    catalog maps ISBNs to records (see load_isbn_catalog). ISBNs that are
+    invalid or missing from the catalog are yielded as errors.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            isbn = line.strip().replace("-", "").replace(" ", "")
+            if not isbn:
+                continue
+            if not isbn_is_valid(isbn):
+                yield {"_error": "invalid ISBN", "ISBN": isbn}
+            elif isbn not in catalog:
+                yield {"_error": "ISBN not in catalog", "ISBN": isbn}
+            else:
+                yield catalog[isbn]
+
+
+def load_isbn_catalog(path):
+    """Load a CSV with ISBN, Title, Author, Year and Genre columns into a dict"""
+    if path is None:
+        return {}
+    return {row["ISBN"].replace("-", "").strip(): row for row in read_csv(path)}
+
+
+def validate(record):
+    """Return ((title, author, year, genre), None) for a good record or (None, reason)"""
+    if not isinstance(record, dict):
+        return None, "not a record"
+    if "_error" in record:
+        return None, record["_error"]
+    title = str(record.get("Title") or "").strip()
+    author = str(record.get("Author") or "").strip()
+    if not title or not author:
+        return None, "Title and Author are required"
+    try:
+        year = int(float(record.get("Year") or 0))
+    except (TypeError, ValueError, OverflowError):
+        return None, "Year is not a number"
+    if abs(year) > MAX_YEAR:
+        return None, "Year is out of range"
+    return (title, author, year, str(record.get("Genre") or "").strip()), None
+
+
+def book_key(title, author, year):
+    """Key used to detect duplicate books"""
+    return normalize(title), normalize(author), int(year)
+
+
+def import_records(library, records, rejects_path=None, batch_size=BATCH_SIZE):
+    """Validate, deduplicate and store records in batches.
+
+    Rejected records are written to rejects_path (when given) with a
+    Reason column. Returns (imported, rejected, seconds).
+    """
+    start = time.perf_counter()
+    seen = {book_key(title, author, year) for _, title, author, year, _ in library.iter_books()}
+    imported = rejected = 0
+    rejects_file = rejects_writer = None
+    batch = []
+
+    def reject(record, reason):
+        nonlocal rejects_file, rejects_writer, rejected
+        rejected += 1
+        if rejects_path is None:
+            return
+        if rejects_writer is None:
+            rejects_file = open(rejects_path, "w", newline="", encoding="utf-8")
+            rejects_writer = csv.DictWriter(rejects_file, ["ISBN"] + COLUMNS + ["Reason"], extrasaction="ignore")
+            rejects_writer.writeheader()
+        rejects_writer.writerow({**(record if isinstance(record, dict) else {}), "Reason": reason})
+
+    try:
+        for record in records:
+            book, reason = validate(record)
+            if book is None:
+                reject(record, reason)
+                continue
+            key = book_key(*book[:3])
+            if key in seen:
+                reject(record, "duplicate")
+                continue
+            seen.add(key)
+            batch.append(book)
+            if len(batch) >= batch_size:
+                library.add_books(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            library.add_books(batch)
+            imported += len(batch)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+    return imported, rejected, time.perf_counter() - start
+
+
+def export_books(library, path, fmt=None):
+    """Stream the catalog to a CSV or JSON Lines file. Returns the number of books."""
+    fmt = fmt or ("jsonl" if path.endswith(".jsonl") else "csv")
+    exported = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for book in library.iter_books():
+                f.write(json.dumps(dict(zip(["id"] + COLUMNS, book))) + "\n")
+                exported += 1
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["id"] + COLUMNS)
+            for book in library.iter_books():
+                writer.writerow(book)
+                exported += 1
+    return exported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import and export for the personal library.")
+    parser.add_argument("--backend", choices=["sqlite", "csv"], default=os.environ.get("LIBRARY_BACKEND", "sqlite"))
+    parser.add_argument("--library", help="library file (default: library.db, or library.csv for --backend csv)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="add books from a CSV, JSON Lines or ISBN list file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=["csv", "jsonl", "isbn"],
+                               help="input format (default: from the file extension)")
+    import_parser.add_argument("--rejects", help="write rejected rows and the reason to this CSV file")
+    import_parser.add_argument("--isbn-catalog", help="CSV with ISBN, Title, Author, Year, Genre for --format isbn")
+    import_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    export_parser = commands.add_parser("export", help="write every book to a CSV or JSON Lines file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"])
+    args = parser.parse_args(argv)
+
+    library = open_library(args.backend, args.library or ("library.csv" if args.backend == "csv" else "library.db"))
+    if args.command == "export":
+        start = time.perf_counter()
+        exported = export_books(library, args.path, args.format)
+        seconds = time.perf_counter() - start
+        print(f"Exported {exported} books in {seconds:.2f}s ({exported / max(seconds, 1e-9):,.0f} rows/s)")
+        return 0
+
+    fmt = args.format or {".jsonl": "jsonl", ".txt": "isbn"}.get(os.path.splitext(args.path)[1], "csv")
+    if fmt == "jsonl":
+        records = read_jsonl(args.path)
+    elif fmt == "isbn":
+        records = read_isbns(args.path, load_isbn_catalog(args.isbn_catalog))
+    else:
+        records = read_csv(args.path)
+    imported, rejected, seconds = import_records(library, records, args.rejects, args.batch_size)
+    rate = (imported + rejected) / max(seconds, 1e-9)
+    print(f"Imported {imported} books, rejected {rejected} in {seconds:.2f}s ({rate:,.0f} rows/s)")
+    if hasattr(library, "compact"):
+        library.compact()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
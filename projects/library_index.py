@@ -0,0 +1,172 @@
+# library_index.py - Inverted index over book titles and authors
+import bisect
+import heapq
+import re
+import unicodedata
+
+GRAM_SIZE = 3  # Substring lookups use trigrams of the vocabulary
+FUZZY_CANDIDATES = 50  # Tokens per query term that get a full edit-distance check
+
+
+def normalize(text):
+    """Lowercase text, strip accents and turn punctuation into spaces"""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^\w]+", " ", text).strip()
+
+
+def tokenize(text):
+    """Split text into the normalized tokens stored in the index"""
+    return normalize(text).split()
+
+
+def book_tokens(title, author):
+    """Return the distinct tokens indexed for one book"""
+    return sorted(set(tokenize(title)) | set(tokenize(author)))
+
+
+def grams(token):
+    """Return the set of trigrams of a token"""
+    return {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+def edit_distance(a, b):
+    """Return the Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ch_a != ch_b)))
+        previous = current
+    return previous[-1]
+
+
+def similarity(term, token):
+    """Score how well token matches term, from 0 to 1; substrings score 1"""
+    if term in token:
+        return 1.0
+    return 1 - edit_distance(term, token) / max(len(term), len(token))
+
+
+class SearchIndex:
+    """Maps Title and Author tokens to book ids.
+
+    Three structures are kept in step with each other:
+    postings (token -> ids), a sorted vocabulary for prefix lookups and
+    trigram -> tokens for substring lookups. Adding or removing a book
+    only touches the tokens of that book.
+    """
+
+    def __init__(self):
+        self._postings = {}  # token -> set of book ids
+        self._vocabulary = []  # sorted list of tokens
+        self._grams = {}  # trigram -> set of tokens
+        self._books = {}  # book id -> tokens, needed to remove a book
+
+    def __len__(self):
+        return len(self._books)
+
+    def add(self, book_id, tokens):
+        """Index a book under the given tokens (see book_tokens)."""
+        self._books[book_id] = tokens
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+                for gram in grams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+            ids.add(book_id)
+
+    def remove(self, book_id):
+        """Drop a book from the index. Unknown ids are ignored."""
+        for token in self._books.pop(book_id, ()):
+            ids = self._postings[token]
+            ids.discard(book_id)
+            if not ids:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                for gram in grams(token):
+                    self._grams[gram].discard(token)
+                    if not self._grams[gram]:
+                        del self._grams[gram]
+
+    def matching_tokens(self, term):
+        """Return vocabulary tokens that contain term.
+
+        Terms shorter than a trigram only match as a prefix, since nearly
+        every token contains a single letter somewhere.
+        """
+        if len(term) < GRAM_SIZE:
+            start = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+            return self._vocabulary[start:end]
+
+        candidates = None
+        for gram in sorted(grams(term), key=lambda g: len(self._grams.get(g, ()))):
+            tokens = self._grams.get(gram)
+            if not tokens:
+                return []
+            candidates = set(tokens) if candidates is None else candidates & tokens
+            if not candidates:
+                return []
+        return [token for token in candidates if term in token]
+
+    def search(self, query):
+        """Return the ids of books whose title or author match every query term."""
+        result = None
+        for term in sorted(set(tokenize(query)), key=len, reverse=True):
+            ids = set()
+            for token in self.matching_tokens(term):
+                ids |= self._postings[token]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
+
+    def similar_tokens(self, term, limit=FUZZY_CANDIDATES):
+        """Return (token, score) pairs for vocabulary tokens close to term.
+
+        Candidates are the limit tokens with the highest trigram overlap,
+        plus tokens of similar length sharing the first two letters (which
+        catches typos that break every trigram of a short word). Only those
+        are scored by edit distance, so the cost does not grow with the
+        catalog.
+        """
+        term_grams = grams(term)
+        if not term_grams:
+            return [(token, len(term) / len(token)) for token in self.matching_tokens(term)[:limit]]
+
+        shared = {}
+        for gram in term_grams:
+            for token in self._grams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        # Jaccard overlap of the trigram sets, using len - 2 as the size of a token's set
+        overlap = lambda token: shared[token] / (len(term_grams) + len(token) - GRAM_SIZE + 1 - shared[token])
+        candidates = set(heapq.nlargest(limit, shared, key=overlap))
+        same_start = [token for token in self.matching_tokens(term[:2]) if abs(len(token) - len(term)) <= 2]
+        candidates.update(same_start[:limit])
+        return [(token, similarity(term, token)) for token in candidates]
+
+    def fuzzy_search(self, query, k=10, min_score=0.5):
+        """Return the top k (book id, score) pairs for a possibly misspelled query.
+
+        A book's score is the average over query terms of its best matching
+        token's similarity, so every term counts towards the ranking.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        scores = {}
+        for term in terms:
+            best = {}
+            for token, score in self.similar_tokens(term):
+                for book_id in self._postings[token]:
+                    if score > best.get(book_id, 0):
+                        best[book_id] = score
+            for book_id, score in best.items():
+                scores[book_id] = scores.get(book_id, 0) + score / len(terms)
+        ranked = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(book_id, score) for book_id, score in ranked if score >= min_score]
@@ -0,0 +1,615 @@
+# library_storage.py - Storage layer for the personal library manager
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing, contextmanager
+
+import pandas as pd
+
+from library_index import SearchIndex, book_tokens
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+COLUMNS = ["Title", "Author", "Year", "Genre"]
+COMPACT_THRESHOLD = 1000  # Journal records that trigger a background compaction
+SORT_COLUMNS = ["id"] + COLUMNS
+
+
+class Library:
+    """Interface shared by the storage backends.
+
+    Books are identified by integer ids that never change. Subclasses
+    provide an `index` property returning a SearchIndex over the catalog.
+    """
+
+    def get_books(self, book_ids):
+        """Return the books with the given ids as a DataFrame, in the order given."""
+        raise NotImplementedError
+
+    def add_books(self, books):
+        """Store (title, author, year, genre) tuples in one write and return their ids."""
+        raise NotImplementedError
+
+    def add_book(self, title, author, year, genre):
+        """Store one book and return its id."""
+        return self.add_books([(title, author, year, genre)])[0]
+
+    def delete_book(self, book_id):
+        """Delete one book by id. Returns False when no such book exists."""
+        raise NotImplementedError
+
+    def count(self):
+        """Return the number of books in the catalog."""
+        raise NotImplementedError
+
+    def iter_books(self):
+        """Yield (id, title, author, year, genre) tuples in id order without loading them all."""
+        raise NotImplementedError
+
+    def version(self):
+        """Return a number that changes whenever the catalog changes."""
+        raise NotImplementedError
+
+    def query_page(self, genre=None, years=None, author=None, sort_by="id", descending=False,
+                   page=0, page_size=50):
+        """Return (page DataFrame, total matches) for one page of a filtered, sorted view.
+
+        genre must match exactly, years is an inclusive (first, last) pair
+        and author matches case-insensitively anywhere in the name.
+        """
+        raise NotImplementedError
+
+    def genres(self):
+        """Return the distinct genres in sorted order."""
+        raise NotImplementedError
+
+    def year_bounds(self):
+        """Return the (earliest, latest) year in the catalog, or (0, 0) when empty."""
+        raise NotImplementedError
+
+    def export_csv(self, csv_path):
+        """Write the catalog to csv_path in the original library.csv format."""
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(book[1:] for book in self.iter_books())
+
+    def search(self, query, limit=None):
+        """Return books whose title or author contain every word of query."""
+        with self._lock:
+            book_ids = sorted(self.index.search(query))
+        if limit is not None:
+            book_ids = book_ids[:limit]
+        return self.get_books(book_ids)
+
+    def fuzzy_search(self, query, k=10):
+        """Return the k best typo-tolerant matches for query with a Score column."""
+        with self._lock:
+            matches = self.index.fuzzy_search(query, k)
+        df = self.get_books([book_id for book_id, _ in matches])
+        df["Score"] = [round(score, 2) for book_id, score in matches if book_id in df.index]
+        return df
+
+
+class SQLiteLibrary(Library):
+    """Keeps the catalog in an SQLite file.
+
+    Every book gets an integer primary key that is never reused (for
+    databases created with AUTOINCREMENT). Adds and deletes touch a single
+    row, and Title, Author, Year and Genre are indexed for lookups. A new
+    connection is opened per call so one instance can be shared between
+    Streamlit sessions running in different threads.
+
+    Title and Author tokens are stored in the search_tokens table in the
+    same transaction as the book itself, and loaded into a SearchIndex the
+    first time search() is called. The index remembers the catalog
+    version it reflects and is reloaded when another process or instance
+    has written since.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._index = None
+        self._index_version = None
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS books (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    Title TEXT NOT NULL,
+                    Author TEXT NOT NULL,
+                    Year INTEGER,
+                    Genre TEXT
+                )
+            """)
+            for column in COLUMNS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_books_{column.lower()} ON books ({column})")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_tokens (
+                    token TEXT NOT NULL,
+                    book_id INTEGER NOT NULL,
+                    PRIMARY KEY (token, book_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_tokens_book ON search_tokens (book_id)")
+            if not conn.execute("SELECT 1 FROM meta WHERE key = 'search_tokens'").fetchone():
+                # Databases created before the index existed are tokenized once
+                for book_id, title, author in conn.execute("SELECT id, Title, Author FROM books").fetchall():
+                    self._store_tokens(conn, book_id, book_tokens(title, author))
+                conn.execute("INSERT INTO meta (key, value) VALUES ('search_tokens', '1')")
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def _store_tokens(conn, book_id, tokens):
+        conn.executemany("INSERT OR IGNORE INTO search_tokens (token, book_id) VALUES (?, ?)",
+                         [(token, book_id) for token in tokens])
+
+    def _insert(self, conn, title, author, year, genre):
+        """Insert one book and its search tokens on an open transaction"""
+        book_id = conn.execute("INSERT INTO books (Title, Author, Year, Genre) VALUES (?, ?, ?, ?)",
+                               (title, author, int(year), genre)).lastrowid
+        tokens = book_tokens(title, author)
+        self._store_tokens(conn, book_id, tokens)
+        if self._index is not None:
+            self._index.add(book_id, tokens)
+        return book_id
+
+    @property
+    def index(self):
+        """The in-memory SearchIndex, loaded from search_tokens on first use and after outside writes"""
+        with self._lock:
+            if self._index is None or self._index_version != self.version():
+                index = SearchIndex()
+                books = {}
+                with closing(self._connect()) as conn:
+                    # One read transaction, so the tokens match the version read with them
+                    conn.execute("BEGIN")
+                    version = self._read_version(conn)
+                    for token, book_id in conn.execute("SELECT token, book_id FROM search_tokens ORDER BY book_id"):
+                        books.setdefault(book_id, []).append(token)
+                    conn.rollback()
+                for book_id, tokens in books.items():
+                    index.add(book_id, tokens)
+                self._index = index
+                self._index_version = version
+            return self._index
+
+    def get_books(self, book_ids):
+        book_ids = [int(book_id) for book_id in book_ids]
+        frames = []
+        with closing(self._connect()) as conn:
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(book_ids), 500):
+                chunk = book_ids[start:start + 500]
+                frames.append(pd.read_sql_query(
+                    f"SELECT id, {', '.join(COLUMNS)} FROM books WHERE id IN ({', '.join('?' * len(chunk))})",
+                    conn, params=chunk, index_col="id"))
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS, index=pd.Index([], name="id"))
+        return pd.concat(frames).reindex(book_ids).dropna(subset=["Title"])
+
+    @staticmethod
+    def _read_version(conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_version(self, conn):
+        """Count a write, and keep the in-memory index only if no one else wrote since it was loaded.
+
+        Bumping takes SQLite's write lock, so the version read right after
+        it cannot move until this transaction ends.
+        """
+        conn.execute("INSERT INTO meta (key, value) VALUES ('version', 1) "
+                     "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+        version = self._read_version(conn)
+        if self._index is not None and self._index_version == version - 1:
+            self._index_version = version
+        else:
+            self._index = None
+
+    @contextmanager
+    def _write(self):
+        """A locked write transaction; a rollback also drops the in-memory index it touched"""
+        with self._lock, closing(self._connect()) as conn:
+            try:
+                with conn:
+                    yield conn
+            except BaseException:
+                self._index = None
+                raise
+
+    def add_books(self, books):
+        with self._write() as conn:
+            self._bump_version(conn)
+            return [self._insert(conn, title, author, year, genre) for title, author, year, genre in books]
+
+    def delete_book(self, book_id):
+        with self._write() as conn:
+            self._bump_version(conn)
+            conn.execute("DELETE FROM search_tokens WHERE book_id = ?", (int(book_id),))
+            if self._index is not None:
+                self._index.remove(int(book_id))
+            return conn.execute("DELETE FROM books WHERE id = ?", (int(book_id),)).rowcount > 0
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def migrate_from_csv(self, csv_path):
+        """Copy the books of an old library.csv into the database, once.
+
+        Returns the number of books imported; 0 when the migration already
+        ran or the file does not exist. The CSV file is left untouched.
+        """
+        if not os.path.exists(csv_path):
+            return 0
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_csv'").fetchone():
+                return 0
+            self._bump_version(conn)
+            imported = 0
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    year = row.get("Year") or 0
+                    self._insert(conn, row["Title"], row["Author"], int(float(year)), row.get("Genre", ""))
+                    imported += 1
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_csv', ?)", (os.path.abspath(csv_path),))
+        return imported
+
+    def iter_books(self):
+        with closing(self._connect()) as conn:
+            yield from conn.execute(f"SELECT id, {', '.join(COLUMNS)} FROM books ORDER BY id")
+
+    def version(self):
+        with closing(self._connect()) as conn:
+            return self._read_version(conn)
+
+    def query_page(self, genre=None, years=None, author=None, sort_by="id", descending=False,
+                   page=0, page_size=50):
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"cannot sort by {sort_by!r}")
+        where, params = [], []
+        if genre is not None:
+            where.append("Genre = ?")
+            params.append(genre)
+        if years is not None:
+            where.append("Year BETWEEN ? AND ?")
+            params.extend(years)
+        if author:
+            where.append("Author LIKE ? ESCAPE '\\'")
+            params.append("%" + author.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+        order = "DESC" if descending else "ASC"
+        with closing(self._connect()) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM books{where_sql}", params).fetchone()[0]
+            df = pd.read_sql_query(
+                f"SELECT id, {', '.join(COLUMNS)} FROM books{where_sql} "
+                f"ORDER BY {sort_by} {order}, id {order} LIMIT ? OFFSET ?",
+                conn, params=params + [page_size, page * page_size], index_col="id")
+        return df, total
+
+    def genres(self):
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT Genre FROM books ORDER BY Genre")]
+
+    def year_bounds(self):
+        with closing(self._connect()) as conn:
+            first, last = conn.execute("SELECT MIN(Year), MAX(Year) FROM books").fetchone()
+        return (first or 0, last or 0)
+
+
+class _FileLock:
+    """An exclusive lock on a file, shared with other processes and re-entrant within this one.
+
+    Callers serialise their own threads first (JournaledCSVLibrary holds
+    its RLock around every use), so the nesting depth needs no lock of its own.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._depth = 0
+
+    def acquire(self, blocking=True):
+        """Take the lock; with blocking=False return False instead of waiting for another process"""
+        if self._depth == 0:
+            f = open(self.path, "a+b")
+            try:
+                if sys.platform == "win32":
+                    f.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                            break
+                        except OSError:
+                            if not blocking:
+                                raise
+                            time.sleep(0.05)
+                else:
+                    fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except OSError:
+                f.close()
+                if blocking:
+                    raise
+                return False
+            self._file = f
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if sys.platform == "win32":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class JournaledCSVLibrary(Library):
+    """Keeps the catalog in a CSV snapshot plus an append-only journal.
+
+    Adds and deletes are appended to `<snapshot>.journal` as JSON lines and
+    fsync'd once per add_books/delete_book call, so earlier data is never rewritten. Once the
+    journal holds COMPACT_THRESHOLD records a background thread folds it
+    into a fresh snapshot written to a temporary file and swapped in with
+    os.replace. Replaying a record twice has no further effect, so a crash
+    at any point of a compaction leaves a loadable library.
+
+    version() compares the mtime and size of the snapshot and journal with
+    the last ones this instance saw, and reloads when another process has
+    written to them. Processes sharing a library take `<snapshot>.lock`
+    around every reload, every append (together with the reload that picks
+    the next id) and the start and end of a compaction. A compaction in
+    progress also holds `<snapshot>.compacting.lock`, so only a crashed
+    one is finished by the next process that loads the library.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self._compacting_path = path + ".compacting"
+        self._next_id_path = path + ".next_id"
+        self._lock = threading.RLock()
+        self._file_lock = _FileLock(path + ".lock")
+        self._compacting_lock = _FileLock(self._compacting_path + ".lock")
+        self._compactor = None
+        self._version = 0
+        with self._lock, self._file_lock:
+            self._load()
+
+    def _load(self):
+        """Replay the snapshot, an interrupted compaction and the journal into memory; needs the file lock"""
+        self._books = {}
+        self._index = SearchIndex()
+        # Ids are never reused, even for deleted books that compaction dropped
+        self._next_id = 1
+        if os.path.exists(self._next_id_path):
+            with open(self._next_id_path, encoding="utf-8") as f:
+                self._next_id = int(f.read())
+        if os.path.exists(self.path):
+            with open(self.path, newline="", encoding="utf-8") as f:
+                for number, row in enumerate(csv.DictReader(f), 1):
+                    # Snapshots written before ids existed are numbered by row
+                    book_id = int(row["id"]) if row.get("id") else number
+                    self._apply({"op": "add", "id": book_id, **row})
+        for journal in (self._compacting_path, self.journal_path):
+            if os.path.exists(journal):
+                with open(journal, encoding="utf-8") as f:
+                    for line in f:
+                        if line.endswith("\n"):  # A torn last line is an unfinished write
+                            self._apply(json.loads(line))
+        self._journal_records = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8") as f:
+                self._journal_records = sum(1 for _ in f)
+        self._seen_files = self._file_state()
+        if (os.path.exists(self._compacting_path) and self._compactor is None
+                and self._compacting_lock.acquire(blocking=False)):
+            # No one holds the compaction lock, so it was interrupted: finish it before a new one can start
+            self._compact(sorted(self._books.items()), self._next_id)
+
+    def _file_state(self):
+        """Return (mtime, size) of the snapshot and the journal, None for a missing file"""
+        state = []
+        for path in (self.path, self.journal_path):
+            try:
+                stat = os.stat(path)
+                state.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                state.append(None)
+        return tuple(state)
+
+    def _apply(self, record):
+        """Apply one add or delete record to the in-memory catalog"""
+        book_id = int(record["id"])
+        self._next_id = max(self._next_id, book_id + 1)
+        if book_id in self._books:
+            self._index.remove(book_id)
+            del self._books[book_id]
+        if record["op"] == "add":
+            year = record.get("Year") or 0
+            book = (record["Title"], record["Author"], int(float(year)), record.get("Genre") or "")
+            self._books[book_id] = book
+            self._index.add(book_id, book_tokens(book[0], book[1]))
+
+    def _append(self, records):
+        """Append a batch of records to the journal with one write and one fsync; needs the file lock"""
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            self._apply(record)
+        self._version += 1
+        self._seen_files = self._file_state()
+        self._journal_records += len(records)
+        if self._journal_records >= COMPACT_THRESHOLD and self._compactor is None:
+            self._start_compaction()
+
+    @property
+    def index(self):
+        with self._lock:
+            self.version()
+            return self._index
+
+    def get_books(self, book_ids):
+        with self._lock:
+            self.version()
+            books = {int(i): self._books[int(i)] for i in book_ids if int(i) in self._books}
+        df = pd.DataFrame.from_dict(books, orient="index", columns=COLUMNS)
+        df.index.name = "id"
+        return df
+
+    def add_books(self, books):
+        with self._lock, self._file_lock:
+            self.version()  # Pick up writes from other processes before choosing ids
+            records = []
+            for title, author, year, genre in books:
+                records.append({"op": "add", "id": self._next_id, "Title": title, "Author": author,
+                                "Year": int(year), "Genre": genre})
+                self._next_id += 1
+            self._append(records)
+            return [record["id"] for record in records]
+
+    def delete_book(self, book_id):
+        with self._lock, self._file_lock:
+            self.version()
+            if int(book_id) not in self._books:
+                return False
+            self._append([{"op": "delete", "id": int(book_id)}])
+            return True
+
+    def count(self):
+        with self._lock:
+            self.version()
+            return len(self._books)
+
+    def migrate_from_csv(self, csv_path):
+        """Nothing to migrate: the CSV file is this backend's snapshot."""
+        return 0
+
+    def iter_books(self):
+        with self._lock:
+            self.version()
+            book_ids = sorted(self._books)
+        for book_id in book_ids:
+            book = self._books.get(book_id)
+            if book is not None:
+                yield (book_id,) + book
+
+    def version(self):
+        with self._lock, self._file_lock:
+            if self._file_state() != self._seen_files:
+                self._load()
+                self._version += 1
+            return self._version
+
+    def query_page(self, genre=None, years=None, author=None, sort_by="id", descending=False,
+                   page=0, page_size=50):
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"cannot sort by {sort_by!r}")
+        author = author.lower() if author else None
+        with self._lock:
+            self.version()
+            rows = [(book_id,) + book for book_id, book in self._books.items()
+                    if (genre is None or book[3] == genre)
+                    and (years is None or years[0] <= book[2] <= years[1])
+                    and (author is None or author in book[1].lower())]
+        column = SORT_COLUMNS.index(sort_by)
+        rows.sort(key=lambda row: (row[column], row[0]), reverse=descending)
+        start = page * page_size
+        df = pd.DataFrame([row[1:] for row in rows[start:start + page_size]], columns=COLUMNS,
+                          index=pd.Index([row[0] for row in rows[start:start + page_size]], name="id"))
+        return df, len(rows)
+
+    def genres(self):
+        with self._lock:
+            self.version()
+            return sorted({book[3] for book in self._books.values()})
+
+    def year_bounds(self):
+        with self._lock:
+            self.version()
+            years = [book[2] for book in self._books.values()]
+        return (min(years), max(years)) if years else (0, 0)
+
+    def _start_compaction(self):
+        """Freeze the current journal and fold it into a new snapshot in the background.
+
+        Needs the file lock, held since the last reload, so that the frozen
+        journal holds no record missing from memory.
+        """
+        if os.path.exists(self._compacting_path) or not self._compacting_lock.acquire(blocking=False):
+            return  # Another process is compacting
+        os.replace(self.journal_path, self._compacting_path)
+        self._journal_records = 0
+        self._seen_files = self._file_state()
+        books = sorted(self._books.items())
+        self._compactor = threading.Thread(target=self._compact, args=(books, self._next_id), daemon=True)
+        self._compactor.start()
+
+    def _compact(self, books, next_id):
+        """Write the frozen catalog as the new snapshot; releases the compaction lock when done"""
+        try:
+            # The id high-water mark goes first: the new snapshot may no longer show it
+            with open(self._next_id_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(str(next_id))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self._next_id_path + ".tmp", self._next_id_path)
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["id"] + COLUMNS)
+                writer.writerows((book_id,) + book for book_id, book in books)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock, self._file_lock:
+                os.replace(tmp_path, self.path)
+                os.remove(self._compacting_path)
+                # Only the snapshot is ours: a journal another process appended to still needs a reload
+                self._seen_files = self._file_state()[:1] + self._seen_files[1:]
+        finally:
+            with self._lock:
+                self._compacting_lock.release()
+                self._compactor = None
+
+    def compact(self):
+        """Run a compaction now and wait for it to finish."""
+        with self._lock, self._file_lock:
+            self.version()
+            compactor = self._compactor
+            if compactor is None and self._journal_records:
+                self._start_compaction()
+                compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+
+def open_library(backend, path):
+    """Open the "sqlite" or "csv" (journaled) backend stored at path"""
+    if backend == "csv":
+        return JournaledCSVLibrary(path)
+    return SQLiteLibrary(path)
@@ -0,0 +1,199 @@
+# password_audit.py - Password strength rules, for one password or millions
+"""Classify passwords as Weak, Moderate or Strong.
+
+As a command, streams one password per line from a file or stdin:
+
+    python password_audit.py dump.txt --workers 8 --records results.tsv
+    cat dump.txt | python password_audit.py - --breached breached.idx
+
+and prints how many passwords fell in each class and the rate. Per-record
+results are written as "line<TAB>strength<TAB>score<TAB>breached", never
+echoing the password itself.
+
+With a breached-password table (see password_breach.py), any password
+found in it is rated Weak whatever its score.
+"""
+import argparse
+import collections
+import itertools
+import os
+import re
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from password_breach import BreachIndex
+
+MIN_LENGTH = 8
+SPECIAL_CHARS = '!@#$%^&*(),.?":{}|<>'
+STRENGTHS = ["Weak", "Moderate", "Strong"]
+BREACHED = "Breached"  # Extra count reported by classify_chunk
+CHUNK_SIZE = 50_000  # Passwords per task sent to a worker process
+
+# Every ASCII character of a class is translated to the same marker, so one
+# translate() pass and one set() pass tell which classes a password uses.
+_MARKERS = str.maketrans({
+    **{ch: "a" for ch in string.ascii_lowercase},
+    **{ch: "A" for ch in string.ascii_uppercase},
+    **{ch: "0" for ch in string.digits},
+    **{ch: "!" for ch in SPECIAL_CHARS},
+})
+
+# Non-ASCII passwords use the original patterns, since \d also matches other scripts' digits
+_LOWER = re.compile(r"[a-z]")
+_UPPER = re.compile(r"[A-Z]")
+_DIGIT = re.compile(r"\d")
+_SPECIAL = re.compile(r"[!@#$%^&*(),.?\":{}|<>]")
+
+
+def strength_score(password):
+    """Return the number of rules (length, lower, upper, digit, special) password meets"""
+    if password.isascii():
+        markers = set(password.translate(_MARKERS))
+        return ((len(password) >= MIN_LENGTH) + ("a" in markers) + ("A" in markers)
+                + ("0" in markers) + ("!" in markers))
+    return ((len(password) >= MIN_LENGTH) + bool(_LOWER.search(password)) + bool(_UPPER.search(password))
+            + bool(_DIGIT.search(password)) + bool(_SPECIAL.search(password)))
+
+
+def strength_label(score):
+    """Map a 0-5 score to Weak, Moderate or Strong"""
+    if score <= 2:
+        return "Weak"
+    elif score == 3 or score == 4:
+        return "Moderate"
+    else:
+        return "Strong"
+
+
+_LABELS = [strength_label(score) for score in range(6)]
+
+
+def check_strength(password):
+    """Return (strength, score) for one password"""
+    score = strength_score(password)
+    return strength_label(score), score
+
+
+def check_password(password, breach_index=None):
+    """Return (strength, score, breached); a breached password is always Weak"""
+    score = strength_score(password)
+    breached = breach_index is not None and password in breach_index
+    return ("Weak" if breached else strength_label(score)), score, breached
+
+
+@lru_cache(maxsize=None)
+def open_breach_index(path):
+    """Open a breached-password table once per process"""
+    return BreachIndex(path)
+
+
+def classify_chunk(first_line, passwords, with_records=False, breach_path=None):
+    """Classify a list of passwords.
+
+    Returns (counts, records): counts maps each strength (and BREACHED)
+    to how many passwords had it, and records (only when with_records is
+    set) holds a (line number, strength, score, breached) tuple per
+    password.
+    """
+    scores = list(map(strength_score, passwords))
+    if breach_path is None:
+        breached = [False] * len(passwords)
+    else:
+        index = open_breach_index(breach_path)
+        breached = [password in index for password in passwords]
+    labels = [("Weak" if hit else _LABELS[score]) for score, hit in zip(scores, breached)]
+    strength_counts = collections.Counter(labels)
+    strength_counts[BREACHED] = sum(breached)
+    records = None
+    if with_records:
+        records = [(first_line + i, label, score, hit)
+                   for i, (label, score, hit) in enumerate(zip(labels, scores, breached))]
+    return strength_counts, records
+
+
+def read_passwords(stream):
+    """Yield passwords from a text stream, one per line, without the line ending"""
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def audit(passwords, workers=1, chunk_size=CHUNK_SIZE, with_records=False, breach_path=None):
+    """Classify an iterable of passwords in chunks, in parallel when workers > 1.
+
+    Yields the (counts, records) result of each chunk in input order. Only
+    a few chunks per worker are in flight at once, so memory stays bounded
+    however long the input is.
+    """
+    chunks = chunked(passwords, chunk_size)
+    if workers <= 1:
+        line = 1
+        for chunk in chunks:
+            yield classify_chunk(line, chunk, with_records, breach_path)
+            line += len(chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        line = 1
+        for chunk in chunks:
+            pending.append(pool.submit(classify_chunk, line, chunk, with_records, breach_path))
+            line += len(chunk)
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify passwords, one per line, by strength.")
+    parser.add_argument("input", help="file with one password per line, or - for stdin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--records", help="write line, strength and score for every password to this file")
+    parser.add_argument("--breached", help="breached-password table built with password_breach.py")
+    args = parser.parse_args(argv)
+
+    stream = (open(sys.stdin.fileno(), encoding="utf-8", errors="surrogateescape", closefd=False)
+              if args.input == "-" else open(args.input, encoding="utf-8", errors="surrogateescape"))
+    records_file = open(args.records, "w", encoding="utf-8") if args.records else None
+    totals = collections.Counter()
+    start = time.perf_counter()
+    try:
+        results = audit(read_passwords(stream), args.workers, args.chunk_size, records_file is not None, args.breached)
+        for counts, records in results:
+            totals.update(counts)
+            if records_file is not None:
+                records_file.writelines(f"{line}\t{strength}\t{score}\t{int(breached)}\n"
+                                        for line, strength, score, breached in records)
+    finally:
+        stream.close()
+        if records_file is not None:
+            records_file.close()
+    seconds = time.perf_counter() - start
+
+    total = sum(totals[strength] for strength in STRENGTHS)
+    for strength in STRENGTHS:
+        print(f"{strength}: {totals[strength]}")
+    if args.breached:
+        print(f"{BREACHED}: {totals[BREACHED]}")
+    print(f"Classified {total} passwords in {seconds:.2f}s ({total / max(seconds, 1e-9):,.0f} per second)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# password_breach.py - Offline lookup of known-breached passwords
+"""Check passwords against a local list of breached SHA-1 hashes.
+
+The list is compiled once into a sorted binary table:
+
+    python password_breach.py build pwned-hashes/ breached.idx
+
+SOURCE is either a directory of Have I Been Pwned range files (each named
+after its 5-character hash prefix and holding "SUFFIX:COUNT" lines) or a
+text file of full "HASH" or "HASH:COUNT" lines in any order. The table is
+memory-mapped for lookups, so checking a password reads a handful of
+pages instead of loading the list into RAM.
+
+Table layout: 8-byte magic, a fan-out table of 65537 little-endian uint64
+record numbers (one per first two hash bytes, plus the end), then the
+20-byte digests in ascending order.
+"""
+import argparse
+import hashlib
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+MAGIC = b"PWSHA1\x00\x01"
+DIGEST_SIZE = 20
+FANOUT = 1 << 16
+HEADER_SIZE = len(MAGIC) + 8 * (FANOUT + 1)
+SORT_CHUNK = 5_000_000  # Digests sorted in memory at a time while building
+
+
+class BreachIndex:
+    """Memory-mapped sorted table of breached SHA-1 digests."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a breached-password table")
+        self._fanout = struct.unpack_from(f"<{FANOUT + 1}Q", self._map, len(MAGIC))
+
+    def __len__(self):
+        return self._fanout[-1]
+
+    def __contains__(self, password):
+        return self.contains_digest(hashlib.sha1(password.encode("utf-8", "surrogateescape")).digest())
+
+    def contains_digest(self, digest):
+        """Binary search for a 20-byte digest within its two-byte bucket"""
+        bucket = digest[0] << 8 | digest[1]
+        lo, hi = self._fanout[bucket], self._fanout[bucket + 1]
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER_SIZE + mid * DIGEST_SIZE
+            probe = data[offset:offset + DIGEST_SIZE]
+            if probe < digest:
+                lo = mid + 1
+            elif probe > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        self._map.close()
+
+
+def read_source(source):
+    """Yield digests from an HIBP range directory or a file of hex hashes"""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            prefix = os.path.splitext(name)[0].upper()
+            with open(os.path.join(source, name), encoding="ascii") as f:
+                for line in f:
+                    suffix = line.split(":", 1)[0].strip()
+                    if suffix:
+                        yield bytes.fromhex(prefix + suffix)
+    else:
+        with open(source, encoding="ascii") as f:
+            for line in f:
+                digest = line.split(":", 1)[0].strip()
+                if digest:
+                    yield bytes.fromhex(digest)
+
+
+def sorted_digests(digests, chunk_size=SORT_CHUNK):
+    """Sort and deduplicate a stream of digests with bounded memory.
+
+    Chunks are sorted in memory and spilled to temporary run files, which
+    are then merged.
+    """
+    runs = []
+    try:
+        while True:
+            chunk = sorted(set(itertools.islice(digests, chunk_size)))
+            if not chunk:
+                break
+            run = tempfile.TemporaryFile()
+            run.write(b"".join(chunk))
+            run.seek(0)
+            runs.append(run)
+
+        def read_run(run):
+            while True:
+                digest = run.read(DIGEST_SIZE)
+                if not digest:
+                    return
+                yield digest
+
+        previous = None
+        for digest in heapq.merge(*(read_run(run) for run in runs)):
+            if digest != previous:
+                yield digest
+                previous = digest
+    finally:
+        for run in runs:
+            run.close()
+
+
+def build_index(source, path):
+    """Compile source into a table at path and return the number of digests"""
+    fanout = [0] * (FANOUT + 1)
+    count = 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(bytes(8 * (FANOUT + 1)))  # Filled in once the bucket sizes are known
+        for digest in sorted_digests(read_source(source)):
+            f.write(digest)
+            fanout[(digest[0] << 8 | digest[1]) + 1] += 1
+            count += 1
+        for bucket in range(FANOUT):
+            fanout[bucket + 1] += fanout[bucket]
+        f.seek(len(MAGIC))
+        f.write(struct.pack(f"<{FANOUT + 1}Q", *fanout))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query an offline breached-password table.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="compile SHA-1 hashes into a lookup table")
+    build_parser.add_argument("source", help="HIBP range directory or file of hex SHA-1 hashes")
+    build_parser.add_argument("output")
+    check_parser = commands.add_parser("check", help="check passwords read one per line from stdin")
+    check_parser.add_argument("index")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(f"Wrote {build_index(args.source, args.output)} hashes to {args.output}")
+        return 0
+
+    index = BreachIndex(args.index)
+    for line in sys.stdin:
+        print("breached" if line.rstrip("\r\n") in index else "not found")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
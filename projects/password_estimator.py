@@ -0,0 +1,718 @@
+# password_estimator.py - Pattern-based password strength estimation
+"""Estimate how many guesses an attacker needs for a password.
+
+Modelled on zxcvbn: the password is split into the cheapest sequence of
+recognised patterns (dictionary words, including reversed and l33t
+spellings, keyboard walks, repeats, sequences and dates) plus brute-forced
+gaps, and the guesses of the parts are multiplied together.
+
+Dictionaries are frequency-ranked word lists compiled into one compact
+trie file that is memory-mapped on load:
+
+    python password_estimator.py build password_dictionaries.bin \\
+        passwords=common-passwords.txt english=english-words.txt names=names.txt
+
+Each list has one word per line, most common first. Without a compiled
+file, the small built-in lists below are used.
+
+For per-keystroke feedback, PasswordEstimator re-scores a growing password
+incrementally and EstimateCache remembers results under a salted hash.
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from collections import OrderedDict, deque
+
+MAGIC = b"PWTRIE\x00\x01"
+DICTIONARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "password_dictionaries.bin")
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BETWEEN_MATCHES = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+REFERENCE_YEAR = 2026
+MIN_YEAR_SPACE = 20
+GUESSES_PER_SECOND = 1e4  # Offline attack on a slow hash
+SCORE_THRESHOLDS = [1e3, 1e6, 1e8, 1e10]  # Guesses needed for scores 1, 2, 3 and 4
+CACHE_ENTRIES = 4096  # Estimate summaries kept by EstimateCache
+MAX_PASSWORD_LENGTH = 100  # Characters estimated; like zxcvbn, the rest are ignored
+
+# Used when no compiled dictionary file exists; most common first
+BUILTIN_DICTIONARIES = {
+    "passwords": """123456 password 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon 123123
+        baseball abc123 football monkey letmein 696969 shadow master 666666 qwertyuiop 123321 mustang
+        1234567890 michael 654321 superman 1qaz2wsx 7777777 121212 000000 qazwsx 123qwe killer trustno1
+        jordan jennifer zxcvbnm asdfgh hunter buster soccer harley batman andrew tigger sunshine iloveyou
+        2000 charlie robert thomas hockey ranger daniel starwars klaster 112233 george computer michelle
+        jessica pepper 1111 zxcvbn 555555 11111111 131313 freedom 777777 pass maggie 159753 aaaaaa ginger
+        princess joshua cheese amanda summer love ashley nicole chelsea biteme matthew access yankees
+        987654321 dallas austin thunder taylor matrix welcome admin login passw0rd hello""".split(),
+    "english": """the of and to in is you that it he was for on are as with his they at be this have from
+        or one had by word but not what all were we when your can said there use an each which she do how
+        their if will up other about out many then them these so some her would make like him into time
+        has look two more write go see number no way could people my than first water been call who oil
+        its now find long down day did get come made may part over new sound take only little work know
+        place year live me back give most very after thing our just name good sentence man think say great
+        where help through much before line right too mean old any same tell boy follow came want show also
+        around form three small set put end does another well large must big even such because turn here
+        why ask went men read need land different home us move try kind hand picture again change off play
+        spell air away animal house point page letter mother answer found study still learn should america
+        world dog cat sun moon star fire love secret dragon monkey master summer winter spring autumn""".split(),
+    "names": """james john robert michael william david richard joseph thomas charles mary patricia jennifer
+        linda elizabeth barbara susan jessica sarah karen daniel matthew anthony mark donald steven paul
+        andrew joshua kevin brian george emily emma olivia ava sophia isabella mia charlotte amelia""".split(),
+}
+
+L33T_TABLE = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "[": "c", "<": "c", "3": "e", "6": "g", "9": "g",
+    "1": "il", "!": "i", "|": "il", "0": "o", "$": "s", "5": "s", "7": "lt", "+": "t", "%": "x", "2": "z",
+}
+
+QWERTY_ROWS = ["`1234567890-=", " qwertyuiop[]\\", " asdfghjkl;'", " zxcvbnm,./"]
+SHIFTED = dict(zip('~!@#$%^&*()_+{}|:"<>?', "`1234567890-=[]\\;',./"))
+
+
+def _keyboard_graph():
+    """Map each unshifted key to its neighbours, in a fixed direction order"""
+    positions = {ch: (r, c) for r, row in enumerate(QWERTY_ROWS) for c, ch in enumerate(row) if ch != " "}
+    keys = {pos: ch for ch, pos in positions.items()}
+    directions = [(0, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1)]
+    return {ch: [keys.get((r + dr, c + dc)) for dr, dc in directions] for ch, (r, c) in positions.items()}
+
+
+KEYBOARD = _keyboard_graph()
+KEYBOARD_STARTS = len(KEYBOARD)
+KEYBOARD_DEGREE = sum(sum(n is not None for n in ns) for ns in KEYBOARD.values()) / len(KEYBOARD)
+
+
+# Dictionary tries
+
+def compile_tries(dictionaries):
+    """Serialize {name: [words, most common first]} into trie bytes.
+
+    Node layout: rank (uint32, 0 when the node ends no word), child count
+    (uint8), the child key bytes, then one uint32 offset per child. Keys
+    sit next to each other so a child is found with a single bytes.find().
+    """
+    roots = []
+    for name, words in dictionaries.items():
+        root = [0, {}]
+        for rank, word in enumerate(words, 1):
+            word = word.strip().lower()
+            if not word or not word.isascii():
+                continue
+            node = root
+            for byte in word.encode("ascii"):
+                node = node[1].setdefault(byte, [0, {}])
+            if not node[0]:
+                node[0] = rank
+        roots.append((name.encode("utf-8"), len(words), root))
+
+    header = MAGIC + struct.pack("<H", len(roots))
+    header += b"".join(struct.pack("<B", len(name)) + name + bytes(8) for name, _, _ in roots)
+
+    # Lay out nodes breadth first, then write them with their children's offsets
+    order, offsets, position = [], {}, len(header)
+    queue = deque(root for _, _, root in roots)
+    while queue:
+        node = queue.popleft()
+        offsets[id(node)] = position
+        order.append(node)
+        position += 5 + 5 * len(node[1])
+        queue.extend(node[1][key] for key in sorted(node[1]))
+
+    out = bytearray(header)
+    at = len(MAGIC) + 2
+    for name, size, root in roots:
+        at += 1 + len(name)
+        struct.pack_into("<II", out, at, offsets[id(root)], size)
+        at += 8
+    for node in order:
+        keys = sorted(node[1])
+        out += struct.pack("<IB", node[0], len(keys)) + bytes(keys)
+        out += struct.pack(f"<{len(keys)}I", *(offsets[id(node[1][key])] for key in keys))
+    return bytes(out)
+
+
+class TrieDictionary:
+    """One ranked word list inside a compiled trie buffer (bytes or mmap)."""
+
+    def __init__(self, name, buffer, root, size):
+        self.name = name
+        self.size = size
+        self._buffer = buffer
+        self._root = root
+
+    def child(self, node, byte):
+        """Return the offset of node's child for byte, or None"""
+        count = self._buffer[node + 4]
+        start = node + 5
+        index = self._buffer.find(bytes((byte,)), start, start + count)
+        if index < 0:
+            return None
+        return struct.unpack_from("<I", self._buffer, start + count + 4 * (index - start))[0]
+
+    def rank(self, node):
+        return struct.unpack_from("<I", self._buffer, node)[0]
+
+    def step(self, walks, ch, position):
+        """Advance partial words by the character ch typed at position.
+
+        walks holds (node, start, l33t substitutions) for every word prefix
+        ending just before position; a new word may also start at ch.
+        Returns the advanced walks and (start, rank, substitutions) for each
+        word that ends at position.
+        """
+        advanced, found = [], []
+        for node, start, subs in walks + [(self._root, position, ())]:
+            for letter in ch + L33T_TABLE.get(ch, ""):
+                if letter.isascii():
+                    child = self.child(node, ord(letter))
+                    if child is not None:
+                        walk = (child, start, subs + ((ch, letter),) if letter != ch else subs)
+                        advanced.append(walk)
+                        rank = self.rank(child)
+                        if rank:
+                            found.append((start, rank, walk[2]))
+        return advanced, found
+
+    def walks(self, text, start):
+        """Yield (end, rank, l33t substitutions) for each word of text beginning at start.
+
+        Characters with l33t readings are tried both as typed and as the
+        letters they may stand for.
+        """
+        stack = [(self._root, start, ())]
+        while stack:
+            node, j, subs = stack.pop()
+            if j > start:
+                rank = self.rank(node)
+                if rank:
+                    yield j - 1, rank, subs
+            if j == len(text):
+                continue
+            ch = text[j]
+            for letter in ch + L33T_TABLE.get(ch, ""):
+                if letter.isascii():
+                    child = self.child(node, ord(letter))
+                    if child is not None:
+                        stack.append((child, j + 1, subs + ((ch, letter),) if letter != ch else subs))
+
+
+def load_dictionaries(path=DICTIONARY_FILE):
+    """Open the compiled dictionary file, or compile the built-in lists in memory"""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        buffer = compile_tries(BUILTIN_DICTIONARIES)
+    return read_dictionaries(buffer, path)
+
+
+def read_dictionaries(buffer, source="buffer"):
+    """Return the TrieDictionary of each list in compiled trie bytes"""
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{source} is not a compiled password dictionary")
+    (count,) = struct.unpack_from("<H", buffer, len(MAGIC))
+    at = len(MAGIC) + 2
+    dictionaries = []
+    for _ in range(count):
+        length = buffer[at]
+        name = bytes(buffer[at + 1:at + 1 + length]).decode("utf-8")
+        root, size = struct.unpack_from("<II", buffer, at + 1 + length)
+        dictionaries.append(TrieDictionary(name, buffer, root, size))
+        at += 1 + length + 8
+    return dictionaries
+
+
+# Matchers; every match is a dict with i, j (inclusive), token, pattern and guesses
+
+def n_choose_k(n, k):
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+
+def uppercase_variations(token):
+    """Extra guesses for the capitalisation of a matched word"""
+    if token.islower() or not any(ch.isalpha() for ch in token):
+        return 1
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) or \
+            (token[-1].isupper() and token[:-1].islower()):
+        return 2
+    upper = sum(ch.isupper() for ch in token)
+    lower = sum(ch.islower() for ch in token)
+    return sum(n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def l33t_variations(token, subs):
+    """Extra guesses for the l33t substitutions used in a matched word"""
+    variations = 1
+    for subbed, letter in set(subs):
+        s = token.count(subbed)
+        u = token.lower().count(letter)
+        variations *= 2 if s == 0 or u == 0 else sum(n_choose_k(s + u, i) for i in range(1, min(s, u) + 1))
+    return variations
+
+
+def dictionary_match(password, dictionary, i, j, rank, subs, reversed_):
+    token = password[i:j + 1]
+    guesses = rank * uppercase_variations(token) * l33t_variations(token, subs)
+    return {"i": i, "j": j, "token": token, "pattern": "dictionary", "dictionary": dictionary.name,
+            "rank": rank, "l33t": bool(subs), "reversed": reversed_, "guesses": guesses * (2 if reversed_ else 1)}
+
+
+def dictionary_matches_at(password, j, dictionaries, walks):
+    """Return (walks, matches) for the dictionary words that end at position j.
+
+    walks holds each dictionary's partial words from position j - 1 (see
+    TrieDictionary.step). Reversed words ending at j are found by reading
+    the password backwards from j.
+    """
+    ch = password[j].lower()
+    backwards = password[j::-1].lower()
+    advanced, matches = [], []
+    for dictionary, dictionary_walks in zip(dictionaries, walks):
+        dictionary_walks, found = dictionary.step(dictionary_walks, ch, j)
+        advanced.append(dictionary_walks)
+        for start, rank, subs in found:
+            matches.append(dictionary_match(password, dictionary, start, j, rank, subs, False))
+        for end, rank, subs in dictionary.walks(backwards, 0):
+            token = backwards[:end + 1]
+            if len(token) < 3 or token == token[::-1]:
+                continue  # Short or palindromic reversals add nothing
+            matches.append(dictionary_match(password, dictionary, j - end, j, rank, subs, True))
+    return advanced, matches
+
+
+def dictionary_matches(password, dictionaries):
+    walks = [[] for _ in dictionaries]
+    matches = []
+    for j in range(len(password)):
+        walks, found = dictionary_matches_at(password, j, dictionaries, walks)
+        matches += found
+    return matches
+
+
+def spatial_matches(password):
+    matches = []
+    keys = [SHIFTED.get(ch, ch.lower()) for ch in password]
+    i = 0
+    while i < len(password) - 1:
+        j = i
+        turns, last_direction = 0, None
+        while j + 1 < len(password) and keys[j] in KEYBOARD and keys[j + 1] in KEYBOARD[keys[j]]:
+            direction = KEYBOARD[keys[j]].index(keys[j + 1])
+            if direction != last_direction:
+                turns += 1
+                last_direction = direction
+            j += 1
+        if j - i >= 2:
+            token = password[i:j + 1]
+            shifted = sum(ch in SHIFTED or ch.isupper() for ch in token)
+            matches.append({"i": i, "j": j, "token": token, "pattern": "spatial", "turns": turns,
+                            "guesses": spatial_guesses(len(token), turns, shifted)})
+        i = max(j, i + 1)
+    return matches
+
+
+def spatial_guesses(length, turns, shifted):
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += n_choose_k(i - 1, j - 1) * KEYBOARD_STARTS * KEYBOARD_DEGREE ** j
+    if shifted:
+        unshifted = length - shifted
+        guesses *= 2 if unshifted == 0 else sum(n_choose_k(length, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+
+REPEAT_GREEDY = re.compile(r"(.+)\1+")
+REPEAT_LAZY = re.compile(r"(.+?)\1+")
+REPEAT_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$")
+
+
+def repeat_matches(password, dictionaries):
+    matches = []
+    start = 0
+    while start < len(password):
+        greedy = REPEAT_GREEDY.search(password, start)
+        if not greedy:
+            break
+        lazy = REPEAT_LAZY.search(password, start)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            # "abcabc" repeats "abc" rather than greedy's whole-string "abcabc"
+            match = greedy
+            base = REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        base_guesses = most_guessable(base, omnimatch(base, dictionaries))["guesses"]
+        count = len(match.group(0)) // len(base)
+        matches.append({"i": match.start(), "j": match.end() - 1, "token": match.group(0), "pattern": "repeat",
+                        "base": base, "guesses": base_guesses * count})
+        start = match.end()
+    return matches
+
+
+def sequence_matches(password):
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        j = i + 1
+        while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+            j += 1
+        if 0 < abs(delta) <= 5 and j - i >= 2:
+            token = password[i:j + 1]
+            first = token[0]
+            if first in "aAzZ019":
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            matches.append({"i": i, "j": j, "token": token, "pattern": "sequence", "ascending": delta > 0,
+                            "guesses": base * len(token) * (1 if delta > 0 else 2)})
+        i = j
+    return matches
+
+
+YEAR = re.compile(r"19\d\d|20\d\d")
+DATE_SEPARATED = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+
+
+def _valid_date(parts):
+    """Return the year if some reading of three numbers is a plausible date, else None"""
+    for year, rest in ((parts[0], parts[1:]), (parts[2], parts[:2])):
+        if year < 100:
+            year += 2000 if year < 50 else 1900
+        if not 1000 <= year <= 2050:
+            continue
+        a, b = rest
+        if (1 <= a <= 12 and 1 <= b <= 31) or (1 <= b <= 12 and 1 <= a <= 31):
+            return year
+    return None
+
+
+def date_matches(password):
+    matches = []
+    for match in YEAR.finditer(password):
+        matches.append({"i": match.start(), "j": match.end() - 1, "token": match.group(0), "pattern": "year",
+                        "guesses": max(abs(int(match.group(0)) - REFERENCE_YEAR), MIN_YEAR_SPACE)})
+    for match in DATE_SEPARATED.finditer(password):
+        year = _valid_date([int(match.group(1)), int(match.group(3)), int(match.group(4))])
+        if year is not None:
+            matches.append({"i": match.start(), "j": match.end() - 1, "token": match.group(0), "pattern": "date",
+                            "guesses": max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365 * 4})
+    for start in range(len(password)):
+        for length in (6, 8):
+            digits = password[start:start + length]
+            if len(digits) != length or not digits.isdigit():
+                continue
+            year_length = 2 if length == 6 else 4
+            readings = ([int(digits[:year_length]), int(digits[year_length:year_length + 2]), int(digits[-2:])],
+                        [int(digits[:2]), int(digits[2:4]), int(digits[4:])])
+            for parts in readings:
+                year = _valid_date(parts)
+                if year is not None:
+                    matches.append({"i": start, "j": start + length - 1, "token": digits, "pattern": "date",
+                                    "guesses": max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365})
+                    break
+    return matches
+
+
+def pattern_matches(password, dictionaries):
+    """Return every match other than dictionary words; these are cheap to redo on each keystroke"""
+    return (spatial_matches(password) + repeat_matches(password, dictionaries) + sequence_matches(password)
+            + date_matches(password))
+
+
+def omnimatch(password, dictionaries):
+    """Return every pattern match found anywhere in password"""
+    return dictionary_matches(password, dictionaries) + pattern_matches(password, dictionaries)
+
+
+def most_guessable(password, matches):
+    """Find the cheapest cover of password by matches and brute-forced gaps.
+
+    guesses = k! * product(match guesses) + MIN_GUESSES_BETWEEN_MATCHES ** (k - 1)
+    for a cover of k parts, as in zxcvbn.
+    """
+    if not password:
+        return {"guesses": 1, "sequence": []}
+    ending = [[] for _ in password]
+    for match in matches:
+        ending[match["j"]].append(match)
+    best = [{0: (1, None, None)}]
+    extend_cover(password, best, ending)
+    return cheapest_cover(password, best, ending[-1])
+
+
+def extend_cover(password, best, ending):
+    """Append rows to best until it covers all of password.
+
+    best[j][k] = (product, (previous j, previous k), part) is the smallest
+    product of k parts covering password[:j], and ending[j] lists the
+    matches that end at position j. A row only depends on the characters
+    before it, so rows already in best are kept as the password grows.
+    """
+    for j in range(len(best), len(password) + 1):
+        candidates = []
+        for match in ending[j - 1]:
+            minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match["j"] == match["i"] else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+            candidates.append((match["i"], max(match["guesses"], minimum), match))
+        for i in range(j):
+            # A brute-forced gap only follows a pattern match, never another gap
+            length = j - i
+            guesses = max(BRUTEFORCE_CARDINALITY ** length,
+                          (MIN_SUBMATCH_GUESSES_SINGLE_CHAR if length == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR) + 1)
+            candidates.append((i, guesses, {"i": i, "j": j - 1, "token": password[i:j],
+                                            "pattern": "bruteforce", "guesses": guesses}))
+        row = {}
+        for i, guesses, part in candidates:
+            for k, (product, _, previous) in best[i].items():
+                if part["pattern"] == "bruteforce" and previous is not None and previous["pattern"] == "bruteforce":
+                    continue
+                total = product * guesses
+                if k + 1 not in row or total < row[k + 1][0]:
+                    row[k + 1] = (total, (i, k), part)
+        best.append(row)
+
+
+def cheapest_cover(password, best, last_matches):
+    """Pick the best number of parts from the final row of best.
+
+    A single match covering the whole password skips the minimum guesses
+    applied to parts, so last_matches (the matches ending at the last
+    character) are reconsidered here.
+
+    A cover of k parts costs at least MIN_GUESSES_BETWEEN_MATCHES ** (k - 1),
+    so counts where that alone reaches the one-part score are skipped, as
+    they can never win. Without that, a long password split into one-letter
+    words mixed a float product with an int beyond float range:
+
+    >>> letters = read_dictionaries(compile_tries({"english": list("abcdefghijklmnopqrstuvwxyz")}))
+    >>> estimate("zxc" + "abcdefghij" * 10, letters)["score"]
+    3
+    """
+    final = dict(best[len(password)])
+    for match in last_matches:
+        if match["i"] == 0 and match["guesses"] < final[1][0]:
+            final[1] = (match["guesses"], (0, 0), match)
+
+    def score(k):
+        return math.factorial(k) * final[k][0] + MIN_GUESSES_BETWEEN_MATCHES ** (k - 1)
+
+    single = score(1)
+    k = min((k for k in final if MIN_GUESSES_BETWEEN_MATCHES ** (k - 1) < single), key=score)
+    guesses = score(k)
+    sequence = []
+    entry = final[k]
+    while entry is not None:
+        _, (j, k), part = entry
+        sequence.append(part)
+        entry = best[j][k] if k else None
+    return {"guesses": guesses, "sequence": sequence[::-1]}
+
+
+# Results
+
+def guesses_to_score(guesses):
+    """Map guesses to a 0 (too guessable) to 4 (very unguessable) score"""
+    return sum(guesses >= threshold for threshold in SCORE_THRESHOLDS)
+
+
+def display_time(seconds):
+    """Render a crack time such as '3 hours' or 'centuries'"""
+    if seconds < 1:
+        return "less than a second"
+    units = [("year", 86400 * 365), ("month", 86400 * 31), ("day", 86400), ("hour", 3600), ("minute", 60),
+             ("second", 1)]
+    if seconds >= 100 * 86400 * 365:
+        return "centuries"
+    for unit, size in units:
+        if seconds >= size:
+            count = round(seconds / size)
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+
+
+def feedback(sequence):
+    """Return a warning about the weakest part of the password, or ''"""
+    if not sequence:
+        return ""
+    part = max(sequence, key=lambda p: p["j"] - p["i"])
+    pattern = part["pattern"]
+    if pattern == "dictionary":
+        if part["dictionary"] == "passwords":
+            if part["rank"] <= 10:
+                return "This is a top-10 common password."
+            if part["rank"] <= 100:
+                return "This is a top-100 common password."
+            return "This is a very common password."
+        if len(sequence) == 1:
+            return "A word by itself is easy to guess."
+        if part["dictionary"] == "names":
+            return "Names and surnames by themselves are easy to guess."
+        if part["l33t"] or part["reversed"]:
+            return "Predictable substitutions like '@' instead of 'a' don't help very much."
+        return "Common words are easy to guess."
+    if pattern == "spatial":
+        return "Straight rows of keys are easy to guess." if part["turns"] == 1 else \
+            "Short keyboard patterns are easy to guess."
+    if pattern == "repeat":
+        return 'Repeats like "aaa" or "abcabc" are easy to guess.'
+    if pattern == "sequence":
+        return "Sequences like abc or 6543 are easy to guess."
+    if pattern in ("date", "year"):
+        return "Dates and years are easy to guess."
+    return ""
+
+
+_dictionaries = None
+
+
+def default_dictionaries():
+    """Load the default dictionaries once per process"""
+    global _dictionaries
+    if _dictionaries is None:
+        _dictionaries = load_dictionaries()
+    return _dictionaries
+
+
+def summarize(password, result):
+    guesses = result["guesses"]
+    return {
+        "guesses": guesses,
+        "guesses_log10": math.log10(guesses),
+        "entropy": math.log2(guesses),
+        "score": guesses_to_score(guesses),
+        "crack_time": display_time(guesses / GUESSES_PER_SECOND),
+        "warning": feedback(result["sequence"]),
+        "sequence": result["sequence"],
+    }
+
+
+def estimate(password, dictionaries=None):
+    """Estimate the strength of password.
+
+    Returns a dict with guesses, guesses_log10, entropy (bits), score (0-4),
+    crack_time (text, for an offline attack on a slow hash), warning and
+    the matched sequence. Only the first MAX_PASSWORD_LENGTH characters
+    are estimated, which keeps the guess products within float range.
+    """
+    return PasswordEstimator(dictionaries).estimate(password)
+
+
+class PasswordEstimator:
+    """Estimates a password as it is typed.
+
+    When a password extends the previously estimated one, only the new
+    characters are matched against the dictionaries and only the new rows
+    of the cover table are computed. The cheap pattern matchers are rerun
+    in full; if that changes any match before the new characters, the
+    cover table is rebuilt, so results always equal estimate()'s.
+    """
+
+    def __init__(self, dictionaries=None):
+        self.dictionaries = default_dictionaries() if dictionaries is None else dictionaries
+        self._reset()
+
+    def _reset(self):
+        self._password = ""
+        self._walks = [[] for _ in self.dictionaries]
+        self._words = []  # Dictionary matches ending at each position
+        self._patterns = []
+        self._best = [{0: (1, None, None)}]
+
+    def estimate(self, password):
+        password = password[:MAX_PASSWORD_LENGTH]
+        if not password.startswith(self._password):
+            self._reset()
+        grown_from = len(self._password)
+        for j in range(grown_from, len(password)):
+            self._walks, found = dictionary_matches_at(password, j, self.dictionaries, self._walks)
+            self._words.append(found)
+        patterns = pattern_matches(password, self.dictionaries)
+        if [match for match in patterns if match["j"] < grown_from] != self._patterns:
+            del self._best[1:]
+        self._password = password
+        self._patterns = patterns
+        if not password:
+            return summarize(password, {"guesses": 1, "sequence": []})
+
+        ending = [list(words) for words in self._words]
+        for match in patterns:
+            ending[match["j"]].append(match)
+        extend_cover(password, self._best, ending)
+        return summarize(password, cheapest_cover(password, self._best, ending[-1]))
+
+
+class EstimateCache:
+    """Thread-safe LRU of estimate summaries keyed by a salted password hash.
+
+    Keys are BLAKE2b digests keyed with a random per-process salt and the
+    values leave out the matched sequence, so the cache holds neither
+    passwords nor pieces of them.
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, password):
+        return hashlib.blake2b(password.encode("utf-8", "surrogateescape"), key=self._salt, digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+            return summary
+
+    def put(self, key, summary):
+        with self._lock:
+            self._entries[key] = {name: value for name, value in summary.items() if name != "sequence"}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile password dictionaries or estimate password strength.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="compile ranked word lists into a trie file")
+    build_parser.add_argument("output")
+    build_parser.add_argument("lists", nargs="+", metavar="NAME=FILE",
+                              help="word list with one word per line, most common first")
+    estimate_parser = commands.add_parser("estimate", help="estimate passwords read one per line from stdin")
+    estimate_parser.add_argument("--dictionaries", default=DICTIONARY_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        dictionaries = {}
+        for item in args.lists:
+            name, path = item.split("=", 1)
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                dictionaries[name] = [line.split()[0] for line in f if line.strip()]
+        with open(args.output, "wb") as f:
+            f.write(compile_tries(dictionaries))
+        print(f"Wrote {', '.join(f'{name} ({len(words)})' for name, words in dictionaries.items())} to {args.output}")
+        return 0
+
+    dictionaries = load_dictionaries(args.dictionaries)
+    for line in sys.stdin:
+        result = estimate(line.rstrip("\r\n"), dictionaries)
+        print(f"score {result['score']}  2^{result['entropy']:.1f} guesses  {result['crack_time']}  {result['warning']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
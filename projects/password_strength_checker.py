@@ -1,30 +1,37 @@
 import streamlit as st
-import re
-
-def check_strength(password):
-    score = 0
-
-    # Conditions
-    length = len(password) >= 8
-    lower = re.search(r"[a-z]", password)
-    upper = re.search(r"[A-Z]", password)
-    digit = re.search(r"\d", password)
-    special = re.search(r"[!@#$%^&*(),.?\":{}|<>]", password)
-
-    # Scoring
-    if length: score += 1
-    if lower: score += 1
-    if upper: score += 1
-    if digit: score += 1
-    if special: score += 1
-
-    # Result
-    if score <= 2:
-        return "Weak", score
-    elif score == 3 or score == 4:
-        return "Moderate", score
-    else:
-        return "Strong", score
+import os
+import time
+
+from password_audit import check_password, open_breach_index
+from password_estimator import EstimateCache, PasswordEstimator
+
+# Optional table of breached passwords built with password_breach.py
+BREACH_INDEX = os.environ.get("PASSWORD_BREACH_INDEX")
+ESTIMATE_STRENGTHS = ["Weak", "Weak", "Moderate", "Moderate", "Strong"]  # By estimator score 0-4
+
+
+@st.cache_resource
+def get_estimate_cache():
+    """Share one salted-hash LRU of results across sessions"""
+    return EstimateCache()
+
+
+def evaluate(password):
+    """Return (summary, cached) for password, reusing earlier results where possible"""
+    cache = get_estimate_cache()
+    key = cache.key(password)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary, True
+    # Each session keeps its own estimator, which re-scores incrementally as the password grows
+    if "password_estimator" not in st.session_state:
+        st.session_state.password_estimator = PasswordEstimator()
+    summary = st.session_state.password_estimator.estimate(password)
+    breach_index = open_breach_index(BREACH_INDEX) if BREACH_INDEX else None
+    summary["breached"] = check_password(password, breach_index)[2]
+    cache.put(key, summary)
+    return summary, False
+
 
 # Streamlit UI
 st.title("🔐 Password Strength Checker")
@@ -32,15 +39,26 @@ st.title("🔐 Password Strength Checker")
 password = st.text_input("Enter your password", type="password")
 
 if password:
-    strength, score = check_strength(password)
+    start = time.perf_counter()
+    result, cached = evaluate(password)
+    elapsed = time.perf_counter() - start
+    breached = result["breached"]
+    strength = "Weak" if breached else ESTIMATE_STRENGTHS[result["score"]]
     st.write(f"**Strength:** {strength}")
+    st.write(f"About 2^{result['entropy']:.0f} guesses, cracked in {result['crack_time']} offline")
 
-    st.progress(score * 20)
+    st.progress((result["score"] + 1) * 20)
+    if result["warning"]:
+        st.caption(result["warning"])
 
     # Tips
-    if strength == "Weak":
+    if breached:
+        st.error("This password appears in a known data breach. Choose a different one.")
+    elif strength == "Weak":
         st.warning("Tip: Use a mix of uppercase, lowercase, numbers, and special characters. Minimum length: 8")
     elif strength == "Moderate":
         st.info("Tip: Add more complexity or increase password length.")
     else:
         st.success("Great! Your password is strong.")
+
+    st.caption(f"Checked in {elapsed * 1000:.2f} ms{' (cached)' if cached else ''}")
@@ -1,24 +1,48 @@
 import streamlit as st
-import pandas as pd
 import os
 
+from library_storage import SORT_COLUMNS, open_library
+
 FILE = "library.csv"
+DB_FILE = "library.db"
+EXPORT_FILE = "library_export.csv"
+PAGE_SIZE = 50  # Books shown per page in View Library
+DELETE_CHOICES = 20  # Search matches offered by the Delete Book picker
+# "sqlite" (default) or "csv" for the journaled CSV snapshot in FILE
+BACKEND = os.environ.get("LIBRARY_BACKEND", "sqlite")
+
+
+@st.cache_resource
+def get_library():
+    # Open the storage once per process; the old CSV is imported into SQLite on first run
+    if BACKEND == "csv":
+        return open_library("csv", FILE)
+    library = open_library("sqlite", DB_FILE)
+    library.migrate_from_csv(FILE)
+    return library
 
-# Initialize CSV
-if not os.path.exists(FILE):
-    df = pd.DataFrame(columns=["Title", "Author", "Year", "Genre"])
-    df.to_csv(FILE, index=False)
+# Views are cached per data version, so any add or delete refreshes them
+@st.cache_data(max_entries=256)
+def fetch_page(version, genre, years, author, sort_by, descending, page, page_size):
+    return get_library().query_page(genre, years, author, sort_by, descending, page, page_size)
 
-def load_data():
-    return pd.read_csv(FILE)
+@st.cache_data(max_entries=16)
+def fetch_genres(version):
+    return get_library().genres()
 
-def save_data(df):
-    df.to_csv(FILE, index=False)
+@st.cache_data(max_entries=16)
+def fetch_year_bounds(version):
+    return get_library().year_bounds()
 
 st.title("📚 Personal Library Manager")
 
 menu = st.sidebar.selectbox("Menu", ["Add Book", "View Library", "Search", "Delete Book"])
 
+# Export the catalog in the original CSV format
+if st.sidebar.button("Export to CSV"):
+    get_library().export_csv(EXPORT_FILE)
+    st.sidebar.success(f"Library exported to {EXPORT_FILE}.")
+
 # Add Book
 if menu == "Add Book":
     st.header("➕ Add a New Book")
@@ -29,10 +53,7 @@ if menu == "Add Book":
 
     if st.button("Add Book"):
         if title and author:
-            new_book = pd.DataFrame([[title, author, year, genre]], columns=["Title", "Author", "Year", "Genre"])
-            df = load_data()
-            df = pd.concat([df, new_book], ignore_index=True)
-            save_data(df)
+            get_library().add_book(title, author, year, genre)
             st.success("Book added!")
         else:
             st.warning("Title and Author are required.")
@@ -40,27 +61,61 @@ if menu == "Add Book":
 # View Library
 elif menu == "View Library":
     st.header("📖 Your Library")
-    df = load_data()
+    library = get_library()
+    version = library.version()
+
+    # Filters and sorting are applied by the storage layer; only one page is fetched
+    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    genre = filter_col1.selectbox("Genre", ["All"] + fetch_genres(version))
+    first_year, last_year = fetch_year_bounds(version)
+    last_year = max(last_year, first_year + 1)  # The slider needs a non-empty range
+    years = filter_col2.slider("Year", first_year, last_year, (first_year, last_year))
+    author = filter_col3.text_input("Author contains")
+    sort_col1, sort_col2, sort_col3 = st.columns(3)
+    sort_by = sort_col1.selectbox("Sort by", SORT_COLUMNS,
+                                  format_func=lambda column: "Date added" if column == "id" else column)
+    descending = sort_col2.checkbox("Descending")
+    page = sort_col3.number_input("Page", min_value=1, value=1, step=1)
+
+    df, total = fetch_page(version, None if genre == "All" else genre, tuple(years), author, sort_by, descending,
+                           page - 1, PAGE_SIZE)
     st.dataframe(df)
+    page_count = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    st.caption(f"Page {page} of {page_count} ({total} books)")
 
 # Search Book
 elif menu == "Search":
     st.header("🔍 Search Books")
-    query = st.text_input("Enter title or author keyword").lower()
+    query = st.text_input("Enter title or author keyword")
     if query:
-        df = load_data()
-        results = df[df.apply(lambda row: query in row["Title"].lower() or query in row["Author"].lower(), axis=1)]
+        results = get_library().search(query)
         if not results.empty:
             st.dataframe(results)
         else:
-            st.info("No matches found.")
+            # Fall back to typo-tolerant matching
+            close_matches = get_library().fuzzy_search(query)
+            if not close_matches.empty:
+                st.info("No exact matches. Did you mean:")
+                st.dataframe(close_matches)
+            else:
+                st.info("No matches found.")
 
 # Delete Book
 elif menu == "Delete Book":
     st.header("🗑️ Delete a Book")
-    df = load_data()
-    book_to_delete = st.selectbox("Select a book to delete", df["Title"])
-    if st.button("Delete"):
-        df = df[df["Title"] != book_to_delete]
-        save_data(df)
-        st.success(f"'{book_to_delete}' deleted.")
+    # Type-ahead: only books matching the query are offered, straight from the search index
+    query = st.text_input("Find the book to delete (title or author)")
+    if query:
+        matches = get_library().search(query, limit=DELETE_CHOICES)
+        if matches.empty:
+            st.info("No matches found.")
+        else:
+            book_to_delete = st.selectbox(
+                "Select a book to delete", matches.index,
+                format_func=lambda book_id: f"{matches.at[book_id, 'Title']} by {matches.at[book_id, 'Author']} "
+                                            f"({matches.at[book_id, 'Year']}) #{book_id}")
+            if st.button("Delete"):
+                if get_library().delete_book(book_to_delete):
+                    st.success(f"'{matches.at[book_to_delete, 'Title']}' deleted.")
+                else:
+                    st.warning("That book was already deleted.")
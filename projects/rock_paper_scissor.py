@@ -1,72 +1,86 @@
 import tkinter as tk
-import random
-
-options = ["Rock", "Paper", "Scissors"]
-
-def decide_winner(p1, p2):
-    if p1 == p2:
-        return "It's a tie!"
-    elif (p1 == "Rock" and p2 == "Scissors") or (p1 == "Paper" and p2 == "Rock") or (p1 == "Scissors" and p2 == "Paper"):
-        return "Player 1 wins!"
-    else:
-        return "Player 2 wins!"
-
-def user_vs_user():
-    result_label.config(text="Player 1, choose your move.")
-    input_frame.pack()
-    play_button.config(command=play_user_vs_user)
-
-def user_vs_computer():
-    result_label.config(text="Choose your move against the computer.")
-    input_frame.pack()
-    play_button.config(command=play_user_vs_computer)
-
-def computer_vs_computer():
-    p1 = random.choice(options)
-    p2 = random.choice(options)
-    result = decide_winner(p1, p2)
-    result_label.config(text=f"Computer 1 chose {p1}\nComputer 2 chose {p2}\n{result}")
-    input_frame.pack_forget()
-
-def play_user_vs_user():
-    p1 = player1_var.get()
-    p2 = player2_var.get()
-    result = decide_winner(p1, p2)
-    result_label.config(text=f"Player 1 chose {p1}\nPlayer 2 chose {p2}\n{result}")
-
-def play_user_vs_computer():
-    p1 = player1_var.get()
-    p2 = random.choice(options)
-    result = decide_winner(p1, p2)
-    result_label.config(text=f"You chose {p1}\nComputer chose {p2}\n{result}")
-
-# GUI setup
-root = tk.Tk()
-root.title("Rock Paper Scissors")
-
-# Mode buttons
-mode_frame = tk.Frame(root)
-tk.Button(mode_frame, text="User vs User", command=user_vs_user).pack(side=tk.LEFT, padx=10, pady=10)
-tk.Button(mode_frame, text="User vs Computer", command=user_vs_computer).pack(side=tk.LEFT, padx=10, pady=10)
-tk.Button(mode_frame, text="Computer vs Computer", command=computer_vs_computer).pack(side=tk.LEFT, padx=10, pady=10)
-mode_frame.pack()
-
-# Input frame
-input_frame = tk.Frame(root)
-player1_var = tk.StringVar()
-player2_var = tk.StringVar()
-
-tk.Label(input_frame, text="Player 1:").grid(row=0, column=0)
-tk.OptionMenu(input_frame, player1_var, *options).grid(row=0, column=1)
-
-tk.Label(input_frame, text="Player 2:").grid(row=1, column=0)
-tk.OptionMenu(input_frame, player2_var, *options).grid(row=1, column=1)
-
-play_button = tk.Button(input_frame, text="Play")
-play_button.grid(row=2, columnspan=2, pady=10)
-
-# Result label
-result_label = tk.Label(root, text="Choose a game mode to start!", font=("Arial", 12), wraplength=300, justify="center")
-result_label.pack(pady=20)
-
-root.mainloop()
\ No newline at end of file
+
+from rps_engine import MOVES, RESULTS, move_index, outcome, play_round
+from rps_strategies import STRATEGIES, make_strategy
+
+
+class RockPaperScissorsApp:
+    def __init__(self, master):
+        self.master = master
+
+        # Mode buttons
+        mode_frame = tk.Frame(master)
+        tk.Button(mode_frame, text="User vs User", command=self.user_vs_user).pack(side=tk.LEFT, padx=10, pady=10)
+        tk.Button(mode_frame, text="User vs Computer", command=self.user_vs_computer).pack(side=tk.LEFT, padx=10, pady=10)
+        tk.Button(mode_frame, text="Computer vs Computer", command=self.computer_vs_computer).pack(side=tk.LEFT, padx=10, pady=10)
+        mode_frame.pack()
+
+        # Input frame
+        self.input_frame = tk.Frame(master)
+        self.player1_var = tk.StringVar()
+        self.player2_var = tk.StringVar()
+
+        tk.Label(self.input_frame, text="Player 1:").grid(row=0, column=0)
+        tk.OptionMenu(self.input_frame, self.player1_var, *MOVES).grid(row=0, column=1)
+
+        tk.Label(self.input_frame, text="Player 2:").grid(row=1, column=0)
+        tk.OptionMenu(self.input_frame, self.player2_var, *MOVES).grid(row=1, column=1)
+
+        self.play_button = tk.Button(self.input_frame, text="Play")
+        self.play_button.grid(row=2, columnspan=2, pady=10)
+
+        # Computer opponent, which learns from your moves as you play
+        self.strategy_frame = tk.Frame(master)
+        self.strategy_var = tk.StringVar(value="ensemble")
+        tk.Label(self.strategy_frame, text="Computer:").pack(side=tk.LEFT)
+        tk.OptionMenu(self.strategy_frame, self.strategy_var, *STRATEGIES,
+                      command=lambda name: self.new_computer()).pack(side=tk.LEFT)
+        self.computer = make_strategy(self.strategy_var.get())
+
+        # Result label
+        self.result_label = tk.Label(master, text="Choose a game mode to start!", font=("Arial", 12), wraplength=300, justify="center")
+        self.result_label.pack(pady=20)
+
+    def new_computer(self):
+        self.computer = make_strategy(self.strategy_var.get())
+
+    def user_vs_user(self):
+        self.result_label.config(text="Player 1, choose your move.")
+        self.strategy_frame.pack_forget()
+        self.input_frame.pack()
+        self.play_button.config(command=self.play_user_vs_user)
+
+    def user_vs_computer(self):
+        self.result_label.config(text="Choose your move against the computer.")
+        self.strategy_frame.pack()
+        self.input_frame.pack()
+        self.new_computer()
+        self.play_button.config(command=self.play_user_vs_computer)
+
+    def computer_vs_computer(self):
+        p1, p2, result = play_round()
+        self.result_label.config(text=f"Computer 1 chose {MOVES[p1]}\nComputer 2 chose {MOVES[p2]}\n{RESULTS[result]}")
+        self.input_frame.pack_forget()
+        self.strategy_frame.pack_forget()
+
+    def play_user_vs_user(self):
+        p1 = self.player1_var.get()
+        p2 = self.player2_var.get()
+        if p1 and p2:
+            result = RESULTS[outcome(move_index(p1), move_index(p2))]
+            self.result_label.config(text=f"Player 1 chose {p1}\nPlayer 2 chose {p2}\n{result}")
+
+    def play_user_vs_computer(self):
+        p1 = self.player1_var.get()
+        if p1:
+            p2 = self.computer.move()
+            self.computer.observe(p2, move_index(p1))
+            result = RESULTS[outcome(move_index(p1), p2)]
+            self.result_label.config(text=f"You chose {p1}\nComputer chose {MOVES[p2]}\n{result}")
+
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    root.title("Rock Paper Scissors")
+    app = RockPaperScissorsApp(root)
+    root.mainloop()
@@ -0,0 +1,119 @@
+# rps_engine.py - Rock Paper Scissors rules and simulation, without a GUI
+"""Moves are small integers and a round is decided by arithmetic:
+
+    outcome(a, b) = (a - b) % 3    # 0 tie, 1 first player wins, 2 second player wins
+
+since each move beats the one just before it (Paper beats Rock, Scissors
+beats Paper, Rock beats Scissors). simulate() plays millions of
+Computer-vs-Computer rounds per second in NumPy batches:
+
+    python rps_engine.py 100000000 --seed 1
+"""
+import argparse
+import random
+import sys
+import time
+
+MOVES = ["Rock", "Paper", "Scissors"]
+ROCK, PAPER, SCISSORS = range(3)
+TIE, FIRST_WINS, SECOND_WINS = range(3)
+RESULTS = ["It's a tie!", "Player 1 wins!", "Player 2 wins!"]
+BATCH_SIZE = 1 << 20  # Rounds generated per NumPy batch
+
+
+def outcome(a, b):
+    """Return TIE, FIRST_WINS or SECOND_WINS for moves a and b"""
+    return (a - b) % 3
+
+
+def move_index(name):
+    """Return the move number for a name in MOVES"""
+    return MOVES.index(name)
+
+
+def decide_winner(p1, p2):
+    """Return the result text for two move names"""
+    return RESULTS[outcome(move_index(p1), move_index(p2))]
+
+
+def random_move(rng=random):
+    return rng.randrange(3)
+
+
+def play_round(rng=random):
+    """Play one random round; returns (move 1, move 2, outcome)"""
+    a, b = random_move(rng), random_move(rng)
+    return a, b, outcome(a, b)
+
+
+def simulate(rounds, seed=None, p1=None, p2=None, batch_size=BATCH_SIZE):
+    """Play rounds random Computer-vs-Computer rounds.
+
+    p1 and p2 are optional [rock, paper, scissors] probabilities for each
+    player (uniform by default). Returns [ties, player 1 wins, player 2
+    wins] as a NumPy array.
+    """
+    import numpy as np  # Only the simulator needs NumPy, not the game itself
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(3, dtype=np.int64)
+    remaining = rounds
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        a = rng.choice(3, size, p=p1).astype(np.int8) if p1 is not None else rng.integers(0, 3, size, dtype=np.int8)
+        b = rng.choice(3, size, p=p2).astype(np.int8) if p2 is not None else rng.integers(0, 3, size, dtype=np.int8)
+        a -= b
+        a %= 3
+        counts += np.bincount(a.view(np.uint8), minlength=3)
+        remaining -= size
+    return counts
+
+
+def distribution(counts):
+    """Return (fraction, standard error) for each outcome in counts; all zeros when no rounds were played"""
+    total = sum(int(count) for count in counts)
+    if total == 0:
+        return [(0.0, 0.0) for _ in counts]
+    fractions = [int(count) / total for count in counts]
+    return [(p, (p * (1 - p) / total) ** 0.5) for p in fractions]
+
+
+def positive_int(text):
+    """Parse a round or batch count, which must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {text}")
+    return value
+
+
+def parse_probabilities(text):
+    """Parse "rock,paper,scissors" weights into probabilities"""
+    if text is None:
+        return None
+    weights = [float(w) for w in text.split(",")]
+    if len(weights) != 3 or min(weights) < 0 or sum(weights) <= 0:
+        raise argparse.ArgumentTypeError("expected three non-negative weights: rock,paper,scissors")
+    return [w / sum(weights) for w in weights]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Computer-vs-Computer Rock Paper Scissors rounds.")
+    parser.add_argument("rounds", type=positive_int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--p1", type=parse_probabilities, help="player 1 weights as rock,paper,scissors")
+    parser.add_argument("--p2", type=parse_probabilities, help="player 2 weights as rock,paper,scissors")
+    parser.add_argument("--batch-size", type=positive_int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = simulate(args.rounds, args.seed, args.p1, args.p2, args.batch_size)
+    seconds = time.perf_counter() - start
+    for label, count, (p, error) in zip(["Ties", "Player 1 wins", "Player 2 wins"], counts, distribution(counts)):
+        print(f"{label}: {count} ({p:.4%} ± {1.96 * error:.4%})")
+    print(f"Simulated {args.rounds} rounds in {seconds:.2f}s ({args.rounds / max(seconds, 1e-9):,.0f} per second)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
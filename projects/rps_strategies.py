@@ -0,0 +1,242 @@
+# rps_strategies.py - Computer opponents for Rock Paper Scissors
+"""Strategies that learn from the other player's moves.
+
+Every strategy answers move() and learns through observe(own, opponent)
+after each round. Learning strategies only look at a fixed-size window of
+recent rounds through rolling counters, so a move costs the same on round
+ten as on round ten million. Benchmark them against each other with:
+
+    python rps_strategies.py --rounds 1000000 frequency markov1 markov2 ensemble
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+from collections import deque
+
+from rps_engine import outcome, positive_int
+
+WINDOW = 100  # Recent rounds remembered by the learning strategies
+ENSEMBLE_DECAY = 0.9  # Weight kept by each predictor's score per round
+
+
+def beats(move):
+    """Return the move that beats move"""
+    return (move + 1) % 3
+
+
+class Strategy:
+    """A Rock Paper Scissors player; moves are numbers as in rps_engine."""
+
+    name = "strategy"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def move(self):
+        raise NotImplementedError
+
+    def observe(self, own, opponent):
+        """Learn from a finished round"""
+
+
+class RandomStrategy(Strategy):
+    name = "random"
+
+    def move(self):
+        return self.rng.randrange(3)
+
+
+class ConstantStrategy(Strategy):
+    """Always plays the same move; an easy target for the learners."""
+
+    name = "rock"
+
+    def __init__(self, move=0, seed=None):
+        super().__init__(seed)
+        self.fixed_move = move
+
+    def move(self):
+        return self.fixed_move
+
+
+class CycleStrategy(Strategy):
+    """Plays Rock, Paper, Scissors, Rock, ... in turn."""
+
+    name = "cycle"
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.next_move = 0
+
+    def move(self):
+        return self.next_move
+
+    def observe(self, own, opponent):
+        self.next_move = (own + 1) % 3
+
+
+class PredictorStrategy(Strategy):
+    """Plays whatever beats predict(), the opponent's most likely next move.
+
+    Random moves are played while there is nothing to predict from.
+    """
+
+    def predict(self):
+        raise NotImplementedError
+
+    def move(self):
+        prediction = self.predict()
+        return self.rng.randrange(3) if prediction is None else beats(prediction)
+
+
+class FrequencyStrategy(PredictorStrategy):
+    """Predicts the opponent's most common move over the last window rounds."""
+
+    name = "frequency"
+
+    def __init__(self, window=WINDOW, seed=None):
+        super().__init__(seed)
+        self.recent = deque(maxlen=window)
+        self.counts = [0, 0, 0]
+
+    def predict(self):
+        if not self.recent:
+            return None
+        return max(range(3), key=self.counts.__getitem__)
+
+    def observe(self, own, opponent):
+        if len(self.recent) == self.recent.maxlen:
+            self.counts[self.recent[0]] -= 1
+        self.recent.append(opponent)
+        self.counts[opponent] += 1
+
+
+class MarkovStrategy(PredictorStrategy):
+    """Order-k Markov chain over both players' moves.
+
+    The context is the last k rounds, each one of 9 (own, opponent) pairs,
+    packed into one number. counts[context * 3 + move] tallies what the
+    opponent played next in that context over the last window rounds.
+    """
+
+    def __init__(self, order=1, window=WINDOW, seed=None):
+        super().__init__(seed)
+        self.name = f"markov{order}"
+        self.order = order
+        self.states = 9 ** order
+        self.counts = [0] * (self.states * 3)
+        self.recent = deque(maxlen=window)  # (context, opponent move) per round
+        self.context = 0
+        self.rounds = 0
+
+    def predict(self):
+        if self.rounds < self.order:
+            return None
+        base = self.context * 3
+        row = self.counts[base:base + 3]
+        best = max(row)
+        return row.index(best) if best else None
+
+    def observe(self, own, opponent):
+        if self.rounds >= self.order:
+            if len(self.recent) == self.recent.maxlen:
+                context, move = self.recent[0]
+                self.counts[context * 3 + move] -= 1
+            self.recent.append((self.context, opponent))
+            self.counts[self.context * 3 + opponent] += 1
+        self.context = (self.context * 9 + own * 3 + opponent) % self.states
+        self.rounds += 1
+
+
+class EnsembleStrategy(PredictorStrategy):
+    """Follows whichever of several predictors has been right most lately.
+
+    Each predictor's score decays by ENSEMBLE_DECAY per round and gains 1
+    when it predicted the opponent's move, so a change of opponent
+    behaviour is picked up within a few rounds.
+    """
+
+    name = "ensemble"
+
+    def __init__(self, predictors=None, decay=ENSEMBLE_DECAY, seed=None):
+        super().__init__(seed)
+        if predictors is None:
+            predictors = [FrequencyStrategy(seed=seed), MarkovStrategy(1, seed=seed), MarkovStrategy(2, seed=seed)]
+        self.predictors = predictors
+        self.decay = decay
+        self.scores = [0.0] * len(predictors)
+        self.predictions = [None] * len(predictors)
+
+    def predict(self):
+        self.predictions = [predictor.predict() for predictor in self.predictors]
+        best = max(range(len(self.predictors)), key=self.scores.__getitem__)
+        return self.predictions[best]
+
+    def observe(self, own, opponent):
+        for i, predictor in enumerate(self.predictors):
+            self.scores[i] = self.scores[i] * self.decay + (self.predictions[i] == opponent)
+            predictor.observe(own, opponent)
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "rock": ConstantStrategy,
+    "cycle": CycleStrategy,
+    "frequency": FrequencyStrategy,
+    "markov1": lambda seed=None: MarkovStrategy(1, seed=seed),
+    "markov2": lambda seed=None: MarkovStrategy(2, seed=seed),
+    "ensemble": EnsembleStrategy,
+}
+
+
+def make_strategy(name, seed=None):
+    """Create a strategy by its name in STRATEGIES"""
+    return STRATEGIES[name](seed=seed)
+
+
+def play_match(first, second, rounds):
+    """Play rounds between two strategies; returns [ties, first wins, second wins]"""
+    counts = [0, 0, 0]
+    first_move, second_move = first.move, second.move
+    first_observe, second_observe = first.observe, second.observe
+    for _ in range(rounds):
+        a = first_move()
+        b = second_move()
+        counts[outcome(a, b)] += 1
+        first_observe(a, b)
+        second_observe(b, a)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pit Rock Paper Scissors strategies against each other.")
+    parser.add_argument("strategies", nargs="*", help=f"any of {', '.join(STRATEGIES)} (default: all)")
+    parser.add_argument("--rounds", type=positive_int, default=1_000_000, help="rounds per pairing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    names = args.strategies or list(STRATEGIES)
+    unknown = set(names) - set(STRATEGIES)
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(sorted(unknown))}")
+
+    print(f"{'first':>10}    {'second':<10} {'first':>7} {'tie':>7} {'second':>7}")
+    total_rounds = 0
+    start = time.perf_counter()
+    for i, (first, second) in enumerate(itertools.combinations(names, 2)):
+        pair_start = time.perf_counter()
+        ties, first_wins, second_wins = play_match(make_strategy(first, args.seed + 2 * i),
+                                                   make_strategy(second, args.seed + 2 * i + 1), args.rounds)
+        seconds = time.perf_counter() - pair_start
+        print(f"{first:>10} vs {second:<10} {first_wins / args.rounds:7.2%} {ties / args.rounds:7.2%} "
+              f"{second_wins / args.rounds:7.2%}  ({args.rounds / max(seconds, 1e-9):,.0f} rounds/s)")
+        total_rounds += args.rounds
+    seconds = time.perf_counter() - start
+    print(f"Played {total_rounds} rounds in {seconds:.2f}s ({total_rounds / max(seconds, 1e-9):,.0f} per second)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
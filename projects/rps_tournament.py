@@ -0,0 +1,131 @@
+# rps_tournament.py - Round-robin tournaments between Rock Paper Scissors strategies
+"""Play every pairing of strategies several times across worker processes.
+
+    python rps_tournament.py --rounds 100000 --repeats 8 --workers 8
+
+Each match gets its own seeds, derived from --seed and the match number,
+so results are the same whichever worker plays a match and however many
+workers there are. Workers write each match's [ties, first wins, second
+wins] straight into one shared array and return nothing else; the parent
+turns the array into a leaderboard once every match is done.
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rps_engine import positive_int
+from rps_strategies import STRATEGIES, make_strategy, play_match
+
+ROUNDS = 100_000  # Rounds per match
+REPEATS = 4  # Matches per pairing
+MATCHES_PER_TASK = 4  # Matches sent to a worker at a time
+Z_95 = 1.96
+
+_results = None  # Shared result array, set in each worker by _attach_results
+
+
+def schedule(names, repeats):
+    """Return (first, second) for every match; each pairing is played repeats times, alternating sides"""
+    matches = []
+    for first, second in itertools.combinations(names, 2):
+        for repeat in range(repeats):
+            matches.append((first, second) if repeat % 2 == 0 else (second, first))
+    return matches
+
+
+def match_seeds(seed, index):
+    """Return the two players' seeds for match index"""
+    return seed * 1_000_003 + 2 * index, seed * 1_000_003 + 2 * index + 1
+
+
+def _attach_results(results):
+    global _results
+    _results = results
+
+
+def play_matches(tasks, rounds, seed):
+    """Play (index, first, second) matches and store their counts in the shared array"""
+    for index, first, second in tasks:
+        first_seed, second_seed = match_seeds(seed, index)
+        counts = play_match(make_strategy(first, first_seed), make_strategy(second, second_seed), rounds)
+        _results[3 * index:3 * index + 3] = counts
+    return len(tasks)
+
+
+def run_tournament(names, rounds=ROUNDS, repeats=REPEATS, workers=1, seed=0):
+    """Play the tournament; returns the schedule and a [ties, first wins, second wins] list per match"""
+    matches = schedule(names, repeats)
+    results = multiprocessing.RawArray("q", 3 * len(matches))
+    tasks = [(index, first, second) for index, (first, second) in enumerate(matches)]
+    chunks = [tasks[i:i + MATCHES_PER_TASK] for i in range(0, len(tasks), MATCHES_PER_TASK)]
+    if workers <= 1:
+        _attach_results(results)
+        for chunk in chunks:
+            play_matches(chunk, rounds, seed)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_attach_results, initargs=(results,)) as pool:
+            for future in [pool.submit(play_matches, chunk, rounds, seed) for chunk in chunks]:
+                future.result()
+    return matches, [list(results[3 * i:3 * i + 3]) for i in range(len(matches))]
+
+
+def leaderboard(names, matches, results, rounds):
+    """Rank strategies by mean score per round, (wins - losses) / rounds.
+
+    Returns (name, mean, 95% confidence half-width, wins, ties, losses)
+    rows, best first. The interval treats each match as one sample.
+    """
+    scores = {name: [] for name in names}
+    totals = {name: [0, 0, 0] for name in names}
+    for (first, second), (ties, first_wins, second_wins) in zip(matches, results):
+        scores[first].append((first_wins - second_wins) / rounds)
+        scores[second].append((second_wins - first_wins) / rounds)
+        for name, wins, losses in ((first, first_wins, second_wins), (second, second_wins, first_wins)):
+            totals[name][0] += wins
+            totals[name][1] += ties
+            totals[name][2] += losses
+    rows = []
+    for name in names:
+        samples = scores[name]
+        mean = statistics.fmean(samples) if samples else 0.0
+        half_width = Z_95 * statistics.stdev(samples) / math.sqrt(len(samples)) if len(samples) > 1 else math.inf
+        rows.append((name, mean, half_width, *totals[name]))
+    return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a round-robin Rock Paper Scissors tournament.")
+    parser.add_argument("strategies", nargs="*", help=f"any of {', '.join(STRATEGIES)} (default: all)")
+    parser.add_argument("--rounds", type=positive_int, default=ROUNDS, help="rounds per match")
+    parser.add_argument("--repeats", type=positive_int, default=REPEATS, help="matches per pairing")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    names = args.strategies or list(STRATEGIES)
+    unknown = set(names) - set(STRATEGIES)
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    matches, results = run_tournament(names, args.rounds, args.repeats, args.workers, args.seed)
+    seconds = time.perf_counter() - start
+
+    print(f"{'':>4} {'strategy':<10} {'score/round':>18} {'wins':>10} {'ties':>10} {'losses':>10}")
+    for place, (name, mean, half_width, wins, ties, losses) in enumerate(
+            leaderboard(names, matches, results, args.rounds), 1):
+        print(f"{place:>4} {name:<10} {mean:+8.4f} ± {half_width:<7.4f} {wins:>10} {ties:>10} {losses:>10}")
+    total = len(matches) * args.rounds
+    print(f"Played {len(matches)} matches ({total} rounds) with {args.workers} workers in {seconds:.2f}s "
+          f"({total / max(seconds, 1e-9):,.0f} rounds per second)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())